@@ -0,0 +1,53 @@
+"""hash user access tokens
+
+Revision ID: 7b0110114dfc
+Revises: 816602545c86
+Create Date: 2026-10-15 21:22:33.989772
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b0110114dfc'
+down_revision: Union[str, None] = '816602545c86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.String()),
+    sa.column('access_token', sa.String()),
+    sa.column('access_token_hash', sa.LargeBinary(32)),
+)
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('access_token_hash', sa.LargeBinary(length=32), nullable=True))
+
+    # Backfill existing rows before tightening the column.
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(users.c.id, users.c.access_token)).all()
+    for user_id, access_token in rows:
+        connection.execute(
+            users.update()
+            .where(users.c.id == user_id)
+            .values(access_token_hash=hashlib.sha256(access_token.encode('utf-8')).digest())
+        )
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('access_token_hash', existing_type=sa.LargeBinary(length=32), nullable=False)
+        batch_op.drop_index('ix_users_access_token')
+        batch_op.create_index(batch_op.f('ix_users_access_token_hash'), ['access_token_hash'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_access_token_hash'))
+        batch_op.create_index('ix_users_access_token', ['access_token'], unique=False)
+        batch_op.drop_column('access_token_hash')
@@ -0,0 +1,33 @@
+"""transactions account date index
+
+Revision ID: 816602545c86
+Revises: df679d6d0ee7
+Create Date: 2026-10-15 21:22:08.737702
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '816602545c86'
+down_revision: Union[str, None] = 'df679d6d0ee7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_transactions_account_date',
+        'transactions',
+        ['account_id', sa.text('date DESC'), sa.text('cached_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.drop_index(op.f('ix_transactions_account_id'), table_name='transactions')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_transactions_account_id'), 'transactions', ['account_id'], unique=False)
+    op.drop_index('ix_transactions_account_date', table_name='transactions')
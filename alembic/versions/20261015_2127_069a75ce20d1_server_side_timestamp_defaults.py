@@ -0,0 +1,53 @@
+"""server side timestamp defaults
+
+Revision ID: 069a75ce20d1
+Revises: 7b0110114dfc
+Create Date: 2026-10-15 21:27:28.999173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '069a75ce20d1'
+down_revision: Union[str, None] = '7b0110114dfc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TIMESTAMP_COLUMNS = (
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('accounts', 'created_at'),
+    ('accounts', 'updated_at'),
+    ('balances', 'cached_at'),
+    ('transactions', 'cached_at'),
+)
+
+
+def _utcnow_default() -> sa.TextClause:
+    if op.get_bind().dialect.name == 'postgresql':
+        return sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)")
+    return sa.text("(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))")
+
+
+def _set_defaults(server_default) -> None:
+    for table, column in TIMESTAMP_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.DateTime(),
+                existing_nullable=False,
+                server_default=server_default,
+            )
+
+
+def upgrade() -> None:
+    _set_defaults(_utcnow_default())
+
+
+def downgrade() -> None:
+    _set_defaults(None)
@@ -1,18 +1,28 @@
 """Database setup utilities for the Teller sample app."""
 from __future__ import annotations
 
+import functools
 import logging
 import os
+import time
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Iterator, Optional
 
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 LOGGER = logging.getLogger(__name__)
 
+_URL_DRIVER_PREFIXES = (
+    ("postgres://", "postgresql+psycopg://"),
+    ("postgresql://", "postgresql+psycopg://"),
+)
 
+
+@functools.lru_cache(maxsize=1)
 def build_database_url() -> str:
     """Return the database URL, defaulting to a local SQLite database.
 
@@ -22,16 +32,18 @@ def build_database_url() -> str:
     
     Normalizes postgres:// URLs to postgresql+psycopg:// for SQLAlchemy 2.0
     compatibility with the psycopg driver.
+
+    The environment is read once per process and the result memoized; call
+    ``build_database_url.cache_clear()`` after changing the variables.
     """
 
     url = os.getenv("DATABASE_INTERNAL_URL")
     if url:
-        # Normalize postgres:// to postgresql+psycopg:// for psycopg driver
-        if url.startswith("postgres://"):
-            url = url.replace("postgres://", "postgresql+psycopg://", 1)
-        elif url.startswith("postgresql://"):
-            # Also handle postgresql:// without explicit driver
-            url = url.replace("postgresql://", "postgresql+psycopg://", 1)
+        # Normalize postgres:// and driverless postgresql:// to the psycopg driver
+        for prefix, replacement in _URL_DRIVER_PREFIXES:
+            if url.startswith(prefix):
+                url = replacement + url[len(prefix):]
+                break
         
         # Render also supplies DATABASE_SSLMODE which we surface as a query (important-comment)
         # parameter when present.
@@ -44,30 +56,90 @@ def build_database_url() -> str:
     return os.getenv("DATABASE_URL", "sqlite:///teller.db")
 
 
+@functools.lru_cache(maxsize=8)
+def mask_database_url(url: str) -> str:
+    """Return ``url`` with any password replaced so it is safe to log."""
+
+    return make_url(url).render_as_string(hide_password=True)
+
+
 def create_db_engine(echo: bool = False) -> Engine:
     """Create the SQLAlchemy engine with connection pooling configured for Render.
-    
-    Connection pool parameters are tuned for Render's starter tier limits:
-    - pool_size=5: Maximum connections kept in the pool
-    - max_overflow=5: Additional connections allowed beyond pool_size
+
+    Pool parameters default to values sized for a handful of concurrent
+    requests and can be overridden through the environment:
+    - DB_POOL_SIZE (10): Connections kept open in the pool
+    - DB_MAX_OVERFLOW (20): Additional connections allowed beyond pool_size
+    - DB_POOL_TIMEOUT (30): Seconds to wait for a connection before failing
+    - DB_POOL_RECYCLE (300): Recycle connections after 5 minutes to prevent timeouts
     - pool_pre_ping=True: Verify connections before use (handles stale connections)
-    - pool_recycle=300: Recycle connections after 5 minutes to prevent timeouts
+    - pool_use_lifo=True: Reuse the most recently returned connection so a
+      small warm set serves steady traffic and idle extras can be recycled
+
+    Keep ``instances x (DB_POOL_SIZE + DB_MAX_OVERFLOW)`` below the Postgres
+    ``max_connections`` limit of the plan. SQLite keeps SQLAlchemy's default
+    pool for its driver.
     """
 
     url = build_database_url()
-    LOGGER.info("Using database %s", url)
-    
+    LOGGER.info("Using database %s", mask_database_url(url))
+
+    pool_options = {}
+    if not url.startswith("sqlite"):
+        pool_options = {
+            "pool_size": _env_int("DB_POOL_SIZE", 10),
+            "max_overflow": _env_int("DB_MAX_OVERFLOW", 20),
+            "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+            "pool_recycle": _env_int("DB_POOL_RECYCLE", 300),
+            "pool_use_lifo": True,
+        }
+
     return create_engine(
         url,
         echo=echo,
         future=True,
         pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=5,
-        pool_recycle=300,
+        **pool_options,
     )
 
 
+def warm_pool(engine: Engine, timeout: Optional[float] = None) -> int:
+    """Open ``pool_size`` connections up front and return them to the pool.
+
+    The first requests after a deploy then reuse established connections
+    instead of paying for connection setup themselves. Failures are logged
+    and otherwise ignored so a slow database does not block startup, and no
+    new connection is started once ``timeout`` seconds (default
+    ``DB_WARM_POOL_TIMEOUT``, 10) have passed. Returns the number of
+    connections opened.
+    """
+
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+    if timeout is None:
+        timeout = _env_int("DB_WARM_POOL_TIMEOUT", 10)
+    deadline = time.monotonic() + timeout
+    connections = []
+    try:
+        for _ in range(pool.size()):
+            if time.monotonic() >= deadline:
+                LOGGER.warning("Connection pool warm-up timed out after %d connections", len(connections))
+                break
+            connections.append(engine.raw_connection())
+    except SQLAlchemyError as exc:
+        LOGGER.warning("Connection pool warm-up stopped after %d connections: %s", len(connections), exc)
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
 def create_session_factory(engine: Engine) -> sessionmaker[Session]:
     """Create a configured ``sessionmaker`` bound to the engine."""
 
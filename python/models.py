@@ -1,25 +1,54 @@
 """SQLAlchemy models for Teller cached data."""
 from __future__ import annotations
 
-import datetime as dt
-from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Numeric, String, Text
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, LargeBinary, Numeric, String, Text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import declarative_base, deferred, relationship
+from sqlalchemy.sql.functions import FunctionElement
 from sqlalchemy.types import JSON
 
 Base = declarative_base()
 
 
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database.
+
+    PostgreSQL's ``CURRENT_TIMESTAMP`` is the transaction start time, and
+    SQLite's ``'now'`` is fixed per statement, so every row written by one
+    enrollment or refresh shares a value. Orderings that need a total order
+    add a tiebreaker column.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _sqlite_utcnow(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has second precision in SQLite.
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
 class TimestampMixin:
     """Common columns for created/updated timestamps."""
 
-    created_at = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
     updated_at = Column(
         DateTime,
-        default=dt.datetime.utcnow,
-        onupdate=dt.datetime.utcnow,
+        server_default=utcnow(),
+        onupdate=utcnow(),
         nullable=False,
     )
 
@@ -28,7 +57,11 @@ class User(Base, TimestampMixin):
     __tablename__ = "users"
 
     id: str = Column(String, primary_key=True)
-    access_token: str = Column(String, nullable=False, index=True)
+    # The raw token is kept for outbound Teller calls; lookups go through the
+    # fixed-width SHA-256 digest so the index stays narrow. Like the index on
+    # the raw token it replaces, it is not unique.
+    access_token: str = Column(String, nullable=False)
+    access_token_hash: bytes = Column(LargeBinary(32), nullable=False, index=True)
     name: Optional[str] = Column(String, nullable=True)
 
     accounts = relationship("Account", back_populates="user", cascade="all, delete-orphan")
@@ -66,11 +99,13 @@ class Balance(Base):
     __tablename__ = "balances"
 
     account_id: str = Column(String, ForeignKey("accounts.id"), primary_key=True)
-    available: Optional[Decimal] = Column(Numeric(18, 2))
-    ledger: Optional[Decimal] = Column(Numeric(18, 2))
+    # The API serves ``raw``; the typed amount columns exist for SQL reporting,
+    # so they are deferred to avoid building Decimals on every ORM load.
+    available = deferred(Column(Numeric(18, 2)), group="amounts")
+    ledger = deferred(Column(Numeric(18, 2)), group="amounts")
     currency: Optional[str] = Column(String)
     raw: dict = Column(JSON, nullable=False)
-    cached_at = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
+    cached_at = Column(DateTime, server_default=utcnow(), nullable=False)
 
     account = relationship("Account", back_populates="balance")
 
@@ -79,13 +114,21 @@ class Transaction(Base):
     __tablename__ = "transactions"
 
     id: str = Column(String, primary_key=True)
-    account_id: str = Column(String, ForeignKey("accounts.id"), index=True, nullable=False)
+    account_id: str = Column(String, ForeignKey("accounts.id"), nullable=False)
     description: Optional[str] = Column(Text)
-    amount: Optional[Decimal] = Column(Numeric(18, 2))
+    amount = deferred(Column(Numeric(18, 2)), group="amounts")
     date: Optional[Date] = Column(Date)
-    running_balance: Optional[Decimal] = Column(Numeric(18, 2))
+    running_balance = deferred(Column(Numeric(18, 2)), group="amounts")
     type: Optional[str] = Column(String)
     raw: dict = Column(JSON, nullable=False)
-    cached_at = Column(DateTime, default=dt.datetime.utcnow, nullable=False, index=True)
+    cached_at = Column(DateTime, server_default=utcnow(), nullable=False, index=True)
 
     account = relationship("Account", back_populates="transactions")
+
+    __table_args__ = (
+        # Matches Repository.list_transactions (filter by account, newest
+        # first) so the LIMIT is served by an index range scan without a sort.
+        # Rows cached together share ``cached_at``, so ``id`` breaks the tie.
+        # The leading account_id column also covers plain account lookups.
+        Index("ix_transactions_account_date", account_id, date.desc(), cached_at.desc(), id.desc()),
+    )
@@ -2,14 +2,97 @@
 from __future__ import annotations
 
 import datetime as dt
+import functools
+import hashlib
+from contextlib import contextmanager
 from decimal import Decimal, InvalidOperation
-from typing import Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Text, bindparam, cast, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, load_only
 
 from . import models
 
+# Statements are built once at import time and executed with bound parameters
+# so SQLAlchemy's compiled cache is hit on every request instead of rebuilding
+# the same construct per call.
+# Authentication reads only these columns; the hash and timestamps stay
+# unloaded (and load lazily if ever touched).
+_STMT_USER_BY_TOKEN = (
+    select(models.User)
+    .options(load_only(models.User.id, models.User.access_token, models.User.name))
+    .where(models.User.access_token_hash == bindparam("token_hash"))
+)
+_STMT_LIST_ACCOUNTS = (
+    select(models.Account)
+    .where(models.Account.user_id == bindparam("user_id"))
+    .order_by(models.Account.name)
+)
+_ACCOUNT_SUMMARY_COLUMNS = (
+    models.Account.id,
+    models.Account.name,
+    models.Account.institution,
+    models.Account.last_four,
+    models.Account.type,
+    models.Account.subtype,
+    models.Account.currency,
+)
+_STMT_LIST_ACCOUNT_SUMMARIES = (
+    select(*_ACCOUNT_SUMMARY_COLUMNS)
+    .where(models.Account.user_id == bindparam("user_id"))
+    .order_by(models.Account.name)
+)
+# Newest first. Rows cached in one transaction share ``cached_at``, so ``id``
+# keeps the order stable; ``ix_transactions_account_date`` covers all three.
+_TRANSACTION_ORDER = (
+    models.Transaction.date.desc(),
+    models.Transaction.cached_at.desc(),
+    models.Transaction.id.desc(),
+)
+_STMT_LIST_TRANSACTIONS = (
+    select(models.Transaction)
+    .where(models.Transaction.account_id == bindparam("account_id"))
+    .order_by(*_TRANSACTION_ORDER)
+    .limit(bindparam("limit"))
+)
+# ``raw`` is read back as its stored JSON text so cached responses can embed it
+# verbatim instead of decoding and re-encoding every payload.
+_STMT_BALANCE_PAYLOAD = (
+    select(models.Account.user_id, cast(models.Balance.raw, Text).label("raw"), models.Balance.cached_at)
+    .join(models.Balance, models.Balance.account_id == models.Account.id)
+    .where(models.Account.id == bindparam("account_id"))
+)
+_STMT_LIST_TRANSACTION_PAYLOADS = (
+    select(cast(models.Transaction.raw, Text).label("raw"), models.Transaction.cached_at)
+    .where(models.Transaction.account_id == bindparam("account_id"))
+    .order_by(*_TRANSACTION_ORDER)
+    .limit(bindparam("limit"))
+)
+_STMT_LIST_TRANSACTION_SUMMARIES = (
+    select(
+        models.Transaction.id,
+        models.Transaction.raw["date"].as_string().label("date"),
+        models.Transaction.raw["amount"].as_string().label("amount"),
+        models.Transaction.raw["description"].as_string().label("description"),
+        models.Transaction.cached_at,
+    )
+    .where(models.Transaction.account_id == bindparam("account_id"))
+    .order_by(*_TRANSACTION_ORDER)
+    .limit(bindparam("limit"))
+)
+_STMT_ENROLLMENT_LOCK = select(func.pg_advisory_xact_lock(func.hashtext(bindparam("key"))))
+_STMT_TRANSACTION_IDS = select(models.Transaction.id).where(
+    models.Transaction.account_id.in_(bindparam("account_ids", expanding=True))
+)
+_STMT_DELETE_TRANSACTIONS = delete(models.Transaction).where(
+    models.Transaction.id.in_(bindparam("ids", expanding=True))
+)
+
+# Rows per statement for bulk writes; keeps bound parameters well under the
+# SQLite (32766) and PostgreSQL (65535) limits.
+BULK_BATCH_SIZE = 1000
+
 
 class Repository:
     """Encapsulates database access patterns for cached Teller data."""
@@ -17,84 +100,135 @@ class Repository:
     def __init__(self, session: Session):
         self.session = session
 
+    # ---------------- Locking ---------------- #
+    @contextmanager
+    def enrollment_lock(self, user_id: str) -> Iterator[None]:
+        """Serialize enrollment writes for ``user_id``.
+
+        On PostgreSQL this takes a transaction-scoped advisory lock, released
+        automatically at commit or rollback, so concurrent reconnects for the
+        same user queue up while other users proceed in parallel. Other
+        databases take no lock; SQLite already serializes writers.
+        """
+
+        if self.session.get_bind().dialect.name == "postgresql":
+            self.session.execute(_STMT_ENROLLMENT_LOCK, {"key": f"enroll:{user_id}"})
+        yield
+
     # ---------------- Users ---------------- #
     def upsert_user(self, user_id: str, access_token: str, name: Optional[str]) -> models.User:
-        user = self.session.get(models.User, user_id)
-        if user:
-            user.access_token = access_token
-            user.name = name or user.name
-        else:
-            user = models.User(id=user_id, access_token=access_token, name=name)
-            self.session.add(user)
-        return user
+        row = {
+            "id": user_id,
+            "access_token": access_token,
+            "access_token_hash": hash_access_token(access_token),
+            "name": name or None,
+        }
+        return _upsert(
+            self.session,
+            models.User,
+            [row],
+            update_columns=("access_token", "access_token_hash", "updated_at"),
+            # Keep the previously stored name when Teller does not send one.
+            extra_set={"name": lambda excluded: func.coalesce(excluded.name, models.User.name)},
+        )[0]
 
     def get_user_by_token(self, token: str) -> Optional[models.User]:
-        stmt = select(models.User).where(models.User.access_token == token)
-        return self.session.execute(stmt).scalar_one_or_none()
+        return self.session.scalars(_STMT_USER_BY_TOKEN, {"token_hash": hash_access_token(token)}).one_or_none()
 
     # ---------------- Accounts ---------------- #
     def upsert_account(self, user: models.User, payload: dict) -> models.Account:
-        account_id = payload.get("id")
-        if not account_id:
-            raise ValueError("Account payload missing id")
-        account = self.session.get(models.Account, account_id)
-        if account:
+        return self.upsert_accounts(user, [payload])[0]
+
+    def upsert_accounts(self, user: models.User, payloads: Iterable[dict]) -> List[models.Account]:
+        """Upsert every account payload in a single statement, in payload order."""
+
+        rows: Dict[str, dict] = {}
+        for payload in payloads:
+            account_id = payload.get("id")
+            if not account_id:
+                raise ValueError("Account payload missing id")
+            institution = payload.get("institution") or {}
             # When a customer reconnects through Teller Connect they may receive
             # a brand new Teller ``user.id`` even though the underlying
-            # accounts are the same.  Re-associate the existing account record
-            # with the latest user so subsequent API requests made with the
-            # fresh access token can see the cached data.
-            account.user = user
-            account.raw = payload
-            account.name = payload.get("name")
-            account.type = payload.get("type")
-            account.subtype = payload.get("subtype")
-            account.last_four = payload.get("last_four") or payload.get("lastFour")
-            institution = payload.get("institution") or {}
-            account.institution = institution.get("id") if isinstance(institution, dict) else institution
-            account.currency = payload.get("currency")
-        else:
-            institution = payload.get("institution") or {}
-            account = models.Account(
-                id=account_id,
-                user=user,
-                raw=payload,
-                name=payload.get("name"),
-                type=payload.get("type"),
-                subtype=payload.get("subtype"),
-                last_four=payload.get("last_four") or payload.get("lastFour"),
-                institution=institution.get("id") if isinstance(institution, dict) else institution,
-                currency=payload.get("currency"),
-            )
-            self.session.add(account)
-        return account
+            # accounts are the same.  Updating ``user_id`` on conflict
+            # re-associates the existing account record with the latest user so
+            # subsequent API requests made with the fresh access token can see the
+            # cached data.
+            rows[account_id] = {
+                "id": account_id,
+                "user_id": user.id,
+                "raw": payload,
+                "name": payload.get("name"),
+                "type": payload.get("type"),
+                "subtype": payload.get("subtype"),
+                "last_four": payload.get("last_four") or payload.get("lastFour"),
+                "institution": institution.get("id") if isinstance(institution, dict) else institution,
+                "currency": payload.get("currency"),
+            }
+        if not rows:
+            return []
+        return _upsert(
+            self.session,
+            models.Account,
+            list(rows.values()),
+            update_columns=(
+                "user_id",
+                "raw",
+                "name",
+                "type",
+                "subtype",
+                "last_four",
+                "institution",
+                "currency",
+                "updated_at",
+            ),
+        )
 
     def list_accounts(self, user: models.User) -> List[models.Account]:
-        stmt = select(models.Account).where(models.Account.user_id == user.id).order_by(models.Account.name)
-        return list(self.session.scalars(stmt))
+        return list(self.session.scalars(_STMT_LIST_ACCOUNTS, {"user_id": user.id}))
+
+    def list_account_summaries(self, user_id: str) -> List[Dict[str, Any]]:
+        """Return the public account fields as plain dicts, skipping ORM loading."""
+
+        rows = self.session.execute(_STMT_LIST_ACCOUNT_SUMMARIES, {"user_id": user_id}).mappings()
+        return [dict(row) for row in rows]
 
     def get_account(self, account_id: str) -> Optional[models.Account]:
         return self.session.get(models.Account, account_id)
 
     # ---------------- Balances ---------------- #
+    def get_balance_payload(self, account_id: str) -> Optional[Row]:
+        """Return ``(user_id, raw, cached_at)`` for an account's cached balance.
+
+        ``raw`` is the stored JSON text. ``None`` when the account or its
+        balance does not exist.
+        """
+
+        return self.session.execute(_STMT_BALANCE_PAYLOAD, {"account_id": account_id}).first()
+
     def update_balance(self, account: models.Account, payload: dict) -> models.Balance:
-        balance = account.balance
-        if balance:
-            balance.raw = payload
-            balance.available = _as_decimal(payload.get("available"))
-            balance.ledger = _as_decimal(payload.get("ledger"))
-            balance.currency = payload.get("currency")
-            balance.cached_at = dt.datetime.utcnow()
-        else:
-            balance = models.Balance(
-                account=account,
-                raw=payload,
-                available=_as_decimal(payload.get("available")),
-                ledger=_as_decimal(payload.get("ledger")),
-                currency=payload.get("currency"),
-            )
-            self.session.add(balance)
-        return balance
+        return self.update_balances([(account, payload)])[0]
+
+    def update_balances(self, items: Iterable[Tuple[models.Account, dict]]) -> List[models.Balance]:
+        """Upsert the balance of every ``(account, payload)`` pair in one statement."""
+
+        rows: Dict[str, dict] = {}
+        for account, payload in items:
+            rows[account.id] = {
+                "account_id": account.id,
+                "raw": payload,
+                "available": _as_decimal(payload.get("available")),
+                "ledger": _as_decimal(payload.get("ledger")),
+                "currency": payload.get("currency"),
+            }
+        if not rows:
+            return []
+        return _upsert(
+            self.session,
+            models.Balance,
+            list(rows.values()),
+            update_columns=("raw", "available", "ledger", "currency", "cached_at"),
+        )
 
     # ---------------- Transactions ---------------- #
     def replace_transactions(
@@ -102,70 +236,170 @@ class Repository:
         account: models.Account,
         payloads: Iterable[dict],
     ) -> List[models.Transaction]:
+        return self.replace_transactions_bulk([(account, payloads)])
+
+    def replace_transactions_bulk(
+        self,
+        items: Iterable[Tuple[models.Account, Iterable[dict]]],
+    ) -> List[models.Transaction]:
+        """Replace the cached transactions of several accounts at once.
+
+        Issues one id lookup, then upserts and deletes in batches of
+        ``BULK_BATCH_SIZE`` rows regardless of how many accounts are given.
+        """
+
+        account_ids: List[str] = []
+        rows: Dict[str, dict] = {}
+        for account, payloads in items:
+            account_ids.append(account.id)
+            for payload in payloads:
+                tx_id = payload.get("id")
+                if not tx_id or tx_id in rows:
+                    continue
+                rows[tx_id] = {
+                    "id": tx_id,
+                    "account_id": account.id,
+                    "raw": payload,
+                    "description": payload.get("description"),
+                    "amount": _as_decimal(payload.get("amount")),
+                    "running_balance": _as_decimal(payload.get("running_balance")),
+                    "date": _as_date(payload.get("date")),
+                    "type": payload.get("type"),
+                }
+        if not account_ids:
+            return []
+
+        existing_ids = set(self.session.scalars(_STMT_TRANSACTION_IDS, {"account_ids": account_ids}))
         transactions: List[models.Transaction] = []
-        existing_ids = {t.id for t in account.transactions}
-        seen = set()
-        for payload in payloads:
-            tx_id = payload.get("id")
-            if not tx_id or tx_id in seen:
-                continue
-            seen.add(tx_id)
-            tx = self.session.get(models.Transaction, tx_id)
-            if tx:
-                tx.raw = payload
-                tx.description = payload.get("description")
-                tx.amount = _as_decimal(payload.get("amount"))
-                tx.running_balance = _as_decimal(payload.get("running_balance"))
-                tx.date = _as_date(payload.get("date"))
-                tx.type = payload.get("type")
-                tx.cached_at = dt.datetime.utcnow()
-            else:
-                tx = models.Transaction(
-                    id=tx_id,
-                    account=account,
-                    raw=payload,
-                    description=payload.get("description"),
-                    amount=_as_decimal(payload.get("amount")),
-                    running_balance=_as_decimal(payload.get("running_balance")),
-                    date=_as_date(payload.get("date")),
-                    type=payload.get("type"),
+        row_list = list(rows.values())
+        for start in range(0, len(row_list), BULK_BATCH_SIZE):
+            transactions.extend(
+                _upsert(
+                    self.session,
+                    models.Transaction,
+                    row_list[start : start + BULK_BATCH_SIZE],
+                    update_columns=("raw", "description", "amount", "running_balance", "date", "type", "cached_at"),
                 )
-                self.session.add(tx)
-            transactions.append(tx)
-            existing_ids.discard(tx_id)
+            )
 
         # Remove transactions no longer returned (within cached window)
-        for tx_id in existing_ids:
-            tx = self.session.get(models.Transaction, tx_id)
-            if tx:
-                self.session.delete(tx)
+        stale_ids = list(existing_ids.difference(rows))
+        for start in range(0, len(stale_ids), BULK_BATCH_SIZE):
+            # Nothing in the session refers to the stale rows, so skip the
+            # identity-map sweep the ORM would otherwise do after the DELETE.
+            self.session.execute(
+                _STMT_DELETE_TRANSACTIONS,
+                {"ids": stale_ids[start : start + BULK_BATCH_SIZE]},
+                execution_options={"synchronize_session": False},
+            )
         return transactions
 
     def list_transactions(self, account_id: str, limit: int = 10) -> List[models.Transaction]:
-        stmt = (
-            select(models.Transaction)
-            .where(models.Transaction.account_id == account_id)
-            .order_by(models.Transaction.date.desc(), models.Transaction.cached_at.desc())
-            .limit(limit)
-        )
-        return list(self.session.scalars(stmt))
+        return list(self.session.scalars(_STMT_LIST_TRANSACTIONS, {"account_id": account_id, "limit": limit}))
+
+    def list_transaction_payloads(self, account_id: str, limit: int = 10) -> Sequence[Row]:
+        """Return ``(raw, cached_at)`` rows with ``raw`` as stored JSON text."""
+
+        return self.session.execute(
+            _STMT_LIST_TRANSACTION_PAYLOADS, {"account_id": account_id, "limit": limit}
+        ).all()
+
+    def list_transaction_summaries(self, account_id: str, limit: int = 10) -> Sequence[Row]:
+        """Return ``(id, date, amount, description, cached_at)`` rows.
+
+        The fields are extracted from ``raw`` by the database, so only the
+        narrowed values cross the wire.
+        """
+
+        return self.session.execute(
+            _STMT_LIST_TRANSACTION_SUMMARIES, {"account_id": account_id, "limit": limit}
+        ).all()
+
+
+def hash_access_token(token: str) -> bytes:
+    """Return the SHA-256 digest stored in ``users.access_token_hash``."""
+
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+# Dialect-specific INSERT constructs that support ``ON CONFLICT DO UPDATE``.
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _upsert(
+    session: Session,
+    model: Any,
+    rows: List[dict],
+    update_columns: Sequence[str],
+    extra_set: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+) -> List[Any]:
+    """Insert ``rows`` or update them in place when the primary key exists.
+
+    Runs as a single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``
+    statement (batched by the driver for multiple rows) and returns the
+    resulting ORM instances in the same order as ``rows``. Server-side column
+    defaults populate ``excluded`` too, so timestamp columns listed in
+    ``update_columns`` pick up a fresh value on conflict.
+    """
+
+    insert = _UPSERT_INSERTS[session.get_bind().dialect.name]
+    stmt = insert(model)
+    set_ = {name: stmt.excluded[name] for name in update_columns}
+    for name, build in (extra_set or {}).items():
+        set_[name] = build(stmt.excluded)
+    primary_key = [column.name for column in model.__table__.primary_key]
+    stmt = stmt.on_conflict_do_update(index_elements=primary_key, set_=set_).returning(
+        model, sort_by_parameter_order=True
+    )
+    result = session.scalars(stmt, rows, execution_options={"populate_existing": True})
+    return list(result)
 
 
 def _as_decimal(value) -> Optional[Decimal]:
     if value is None:
         return None
+    # Teller sends amounts as strings; branch on the exact type so the common
+    # cases skip the ``str()`` round-trip. Floats still go through ``str`` so
+    # ``0.1`` becomes ``Decimal("0.1")`` rather than its binary expansion.
+    value_type = type(value)
+    if value_type is Decimal:
+        return value
+    if value_type is str or value_type is int:
+        return _parse_decimal(value)
     try:
         return Decimal(str(value))
     except (InvalidOperation, ValueError, TypeError):
         return None
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_decimal(value) -> Optional[Decimal]:
+    # Amounts repeat heavily across refreshes (the same transactions come
+    # back every time), and Decimals are immutable, so parsed values are shared.
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        return None
+
+
 def _as_date(value) -> Optional[dt.date]:
     if not value:
         return None
     if isinstance(value, dt.date):
         return value
+    if isinstance(value, str):
+        return _parse_date(value)
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date(value: str) -> Optional[dt.date]:
+    """Parse an ISO date string; memoized because refreshes repeat dates."""
+
     try:
         return dt.date.fromisoformat(value)
-    except Exception:
+    except ValueError:
         return None
@@ -1,41 +1,94 @@
 """Falcon resources for the Teller sample backend."""
 from __future__ import annotations
 
+import hashlib
+import hmac
 import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 import falcon
+import orjson
 from falcon import Request, Response
 
 from . import models
-from .repository import Repository
+from .repository import Repository, hash_access_token
 from .teller_api import TellerAPIError, TellerClient
-from .utils import ensure_json_serializable
-import hmac
-import hashlib
-import json
-import time
-from typing import List, Tuple
+from .utils import TTLCache, json_dumps, log_json
+
+__all__ = [
+    "AccountsResource",
+    "AuthenticatedUser",
+    "BaseResource",
+    "CachedBalanceResource",
+    "CachedTransactionsResource",
+    "ConnectTokenResource",
+    "EnrollmentResource",
+    "LiveBalanceResource",
+    "LiveTransactionsResource",
+    "WebhookResource",
+    "log_enrollment_event",
+    "log_event",
+    "parse_bearer_token",
+    "serialize_account",
+]
 
 LOGGER = logging.getLogger(__name__)
 
+# Upper bound on concurrent Teller requests issued while priming an enrollment.
+PRIMING_MAX_WORKERS = 16
+_PRIMING_EXECUTOR = ThreadPoolExecutor(max_workers=PRIMING_MAX_WORKERS, thread_name_prefix="enrollment-priming")
+
+
+class AuthenticatedUser(NamedTuple):
+    """Detached view of the user behind a bearer token."""
+
+    id: str
+    access_token: str
+    name: Optional[str]
+
+
+# Access tokens are stable for hours, so resolved users are cached briefly
+# (keyed by token digest) to skip the users lookup on every API request.
+# Re-enrollment evicts a user's entries only in the process that handled it;
+# other processes keep accepting a replaced token until the TTL lapses.
+# ``TOKEN_CACHE_TTL_SECONDS`` sets that window, and 0 disables the cache.
+_TOKEN_CACHE = TTLCache(maxsize=4096, ttl=int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60")))
+
 
 def log_enrollment_event(stage: str, **payload: Any) -> None:
     """Emit a structured enrollment log line."""
 
-    record = {"stage": stage, **payload}
-    LOGGER.info("enrollment %s", ensure_json_serializable(record))
+    log_event("enrollment", stage=stage, **payload)
+
+
+def log_event(event: str, level: int = logging.INFO, **fields: Any) -> None:
+    """Emit ``event`` followed by ``fields`` as a single JSON object.
+
+    The record is only encoded when ``level`` is enabled.
+    """
+
+    if LOGGER.isEnabledFor(level):
+        LOGGER.log(level, "%s %s", event, log_json(fields))
+
+
+# Accepts exactly what ``header.split() == ["Bearer", token]`` would: any
+# whitespace around and between the two parts, none inside the token.
+_BEARER_RE = re.compile(r"\s*bearer\s+(\S+)\s*", re.IGNORECASE)
 
 
 def parse_bearer_token(req: Request) -> str:
     auth_header = req.get_header("Authorization")
     if not auth_header:
         raise falcon.HTTPUnauthorized("Authentication required", challenges=["Bearer token"])
-    parts = auth_header.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
+    match = _BEARER_RE.fullmatch(auth_header)
+    if match is None:
         raise falcon.HTTPUnauthorized("Invalid authorization header", challenges=["Bearer token"])
-    return parts[1]
+    return match.group(1)
 
 
 
@@ -46,6 +99,12 @@ class BaseResource:
 
     @contextmanager
     def session_scope(self):
+        """Yield a session whose connection is checked out of the engine pool.
+
+        The connection is held until the block exits, so keep Teller calls
+        and other slow work outside of it where possible.
+        """
+
         session = self._session_factory()
         try:
             yield session
@@ -56,12 +115,32 @@ class BaseResource:
         finally:
             session.close()
 
-    def authenticate(self, req: Request, repo: Repository) -> models.User:
+    def authenticate(self, req: Request, repo: Repository) -> AuthenticatedUser:
+        # The resolved user is memoized on the request so repeated calls
+        # (e.g. from middleware) neither re-parse the header nor re-hash it.
+        authenticated = req.context.get("user")
+        if authenticated is not None:
+            return authenticated
         token = parse_bearer_token(req)
-        user = repo.get_user_by_token(token)
-        if not user:
-            raise falcon.HTTPUnauthorized("Unknown access token", challenges=["Reconnect via Teller Connect"])
-        return user
+        token_hash = hash_access_token(token)
+        authenticated = _TOKEN_CACHE.get(token_hash)
+        if authenticated is None:
+            user = repo.get_user_by_token(token)
+            if not user:
+                raise falcon.HTTPUnauthorized("Unknown access token", challenges=["Reconnect via Teller Connect"])
+            authenticated = AuthenticatedUser(user.id, user.access_token, user.name)
+            _TOKEN_CACHE.set(token_hash, authenticated)
+        req.context.user = authenticated
+        return authenticated
+
+    @staticmethod
+    def owned_account(repo: Repository, account_id: str, user: AuthenticatedUser) -> models.Account:
+        """Return ``account_id`` if it belongs to ``user``, else raise 404."""
+
+        account = repo.get_account(account_id)
+        if not account or account.user_id != user.id:
+            raise falcon.HTTPNotFound()
+        return account
 
     @staticmethod
     def set_no_cache(resp: Response) -> None:
@@ -72,7 +151,7 @@ class ConnectTokenResource(BaseResource):
     def on_post(self, req: Request, resp: Response) -> None:
         payload = req.media or {}
         token = self.teller.create_connect_token(**payload)
-        resp.media = ensure_json_serializable(token)
+        resp.media = token
         self.set_no_cache(resp)
 
 
@@ -89,79 +168,132 @@ class EnrollmentResource(BaseResource):
 
         log_enrollment_event("start", user_id=user_id)
 
-        accounts_response: Optional[Dict[str, Any]] = None
+        # Fetch everything from Teller before opening a session so a pooled
+        # database connection is only held for the write phase.
+        accounts_payload = self.teller.list_accounts(access_token)
+        primed = self._prime_accounts(access_token, accounts_payload)
 
+        priming_results: List[Dict[str, Any]] = []
         with self.session_scope() as session:
             repo = Repository(session)
-            user = repo.upsert_user(user_id, access_token, user_payload.get("name"))
-
-            accounts_payload = list(self.teller.list_accounts(access_token))
-            accounts = [repo.upsert_account(user, account_payload) for account_payload in accounts_payload]
-
-            log_enrollment_event(
-                "accounts_fetched",
-                user_id=user.id,
-                account_ids=[account.id for account in accounts],
-            )
-
-            for account in accounts:
-                priming_result: Dict[str, Any] = {
-                    "user_id": user.id,
-                    "account_id": account.id,
-                    "balance_primed": False,
-                    "transactions_primed": False,
+            with repo.enrollment_lock(user_id):
+                user = repo.upsert_user(user_id, access_token, user_payload.get("name"))
+                accounts = repo.upsert_accounts(user, accounts_payload)
+
+                if accounts:
+                    balances = []
+                    transaction_sets = []
+                    for account in accounts:
+                        priming_result: Dict[str, Any] = {
+                            "user_id": user.id,
+                            "account_id": account.id,
+                            "balance_primed": False,
+                            "transactions_primed": False,
+                        }
+                        balance, transactions = primed[account.id]
+                        if isinstance(balance, TellerAPIError):
+                            priming_result["balance_error"] = str(balance)
+                        else:
+                            balances.append((account, balance))
+                            priming_result["balance_primed"] = True
+                        if isinstance(transactions, TellerAPIError):
+                            priming_result["transactions_error"] = str(transactions)
+                        else:
+                            transaction_sets.append((account, transactions))
+                            priming_result["transactions_primed"] = True
+                            priming_result["transaction_count"] = len(transactions)
+                        priming_results.append(priming_result)
+
+                    repo.update_balances(balances)
+                    repo.replace_transactions_bulk(transaction_sets)
+                    session.flush()
+
+                accounts_response = {
+                    "user": {"id": user.id, "name": user.name},
+                    "accounts": [serialize_account(account) for account in accounts],
                 }
-                try:
-                    balance = self.teller.get_account_balances(access_token, account.id)
-                    repo.update_balance(account, balance)
-                    priming_result["balance_primed"] = True
-                except TellerAPIError as exc:
-                    priming_result["balance_error"] = str(exc)
-                    LOGGER.warning("Failed to prime balance for %s: %s", account.id, exc)
-                try:
-                    transactions = list(self.teller.get_account_transactions(access_token, account.id, count=10))
-                    repo.replace_transactions(account, transactions)
-                    priming_result["transactions_primed"] = True
-                    priming_result["transaction_count"] = len(transactions)
-                except TellerAPIError as exc:
-                    priming_result["transactions_error"] = str(exc)
-                    LOGGER.warning("Failed to prime transactions for %s: %s", account.id, exc)
-
-                log_enrollment_event("priming_result", **priming_result)
 
-            session.flush()
-
-            accounts_response = {
-                "user": {"id": user.id, "name": user.name},
-                "accounts": [serialize_account(account) for account in accounts],
-            }
-
-        if accounts_response is None:
-            log_enrollment_event("finish", user_id=user_id, account_count=0)
-            return
+        # The user's previous token was replaced above; stop serving it from
+        # the authentication cache. This runs after commit so a request racing
+        # the transaction cannot re-cache the old row once it is dropped.
+        _TOKEN_CACHE.discard_where(lambda cached: cached.id == user_id)
 
+        # Logging happens after the session is closed so formatting never
+        # extends the transaction.
+        log_enrollment_event(
+            "accounts_fetched",
+            user_id=user_id,
+            account_ids=[account["id"] for account in accounts_response["accounts"]],
+        )
+        for priming_result in priming_results:
+            if "balance_error" in priming_result:
+                LOGGER.warning(
+                    "Failed to prime balance for %s: %s", priming_result["account_id"], priming_result["balance_error"]
+                )
+            if "transactions_error" in priming_result:
+                LOGGER.warning(
+                    "Failed to prime transactions for %s: %s",
+                    priming_result["account_id"],
+                    priming_result["transactions_error"],
+                )
+            log_enrollment_event("priming_result", **priming_result)
         log_enrollment_event(
             "finish",
             user_id=user_id,
             account_count=len(accounts_response["accounts"]),
         )
-        resp.media = ensure_json_serializable(accounts_response)
+        resp.media = accounts_response
         self.set_no_cache(resp)
 
+    def _prime_accounts(
+        self,
+        access_token: str,
+        accounts_payload: List[Dict[str, Any]],
+    ) -> Dict[str, Tuple[Any, Any]]:
+        """Fetch balances and recent transactions for every account concurrently.
+
+        Each account maps to a ``(balance, transactions)`` pair. A Teller error is
+        returned in place of the result so one failing account does not abort
+        priming for the others.
+        """
+
+        account_ids = [payload["id"] for payload in accounts_payload if payload.get("id")]
+        if not account_ids:
+            return {}
+        # Balances and transactions are independent calls, so both are
+        # submitted for every account at once.
+        futures = {}
+        for account_id in account_ids:
+            futures[_PRIMING_EXECUTOR.submit(self._fetch_balance, access_token, account_id)] = (account_id, 0)
+            futures[_PRIMING_EXECUTOR.submit(self._fetch_transactions, access_token, account_id)] = (account_id, 1)
+
+        results: Dict[str, List[Any]] = {account_id: [None, None] for account_id in account_ids}
+        for future in as_completed(futures):
+            account_id, slot = futures[future]
+            results[account_id][slot] = future.result()
+        return {account_id: (balance, transactions) for account_id, (balance, transactions) in results.items()}
+
+    def _fetch_balance(self, access_token: str, account_id: str) -> Any:
+        try:
+            return self.teller.get_account_balances(access_token, account_id)
+        except TellerAPIError as exc:
+            return exc
+
+    def _fetch_transactions(self, access_token: str, account_id: str) -> Any:
+        try:
+            return self.teller.get_account_transactions(access_token, account_id, count=10)
+        except TellerAPIError as exc:
+            return exc
+
 
 class AccountsResource(BaseResource):
     def on_get(self, req: Request, resp: Response) -> None:
         with self.session_scope() as session:
             repo = Repository(session)
             user = self.authenticate(req, repo)
-            accounts = repo.list_accounts(user)
-            resp.media = ensure_json_serializable(
-                {"accounts": [serialize_account(account) for account in accounts]}
-            )
-            LOGGER.info(
-                "db.accounts.response %s",
-                {"user_id": user.id, "account_ids": [account.id for account in accounts]},
-            )
+            accounts = repo.list_account_summaries(user.id)
+            resp.media = {"accounts": accounts}
+            log_event("db.accounts.response", user_id=user.id, account_ids=[account["id"] for account in accounts])
         self.set_no_cache(resp)
 
 
@@ -170,34 +302,41 @@ class CachedBalanceResource(BaseResource):
         with self.session_scope() as session:
             repo = Repository(session)
             user = self.authenticate(req, repo)
-            account = repo.get_account(account_id)
-            if not account or account.user_id != user.id:
+            balance = repo.get_balance_payload(account_id)
+            if not balance or balance.user_id != user.id:
                 raise falcon.HTTPNotFound()
-            balance = account.balance
-            if not balance:
-                raise falcon.HTTPNotFound()
-            resp.media = ensure_json_serializable(
-                {
-                    "account_id": account.id,
-                    "cached_at": balance.cached_at,
-                    "balance": balance.raw,
-                }
-            )
-            LOGGER.info(
-                "db.accounts.balance.response %s",
-                {"user_id": user.id, "account_id": account.id, "has_balance": bool(balance.raw)},
+        resp.content_type = falcon.MEDIA_JSON
+        resp.data = b"".join(
+            (
+                b'{"account_id":',
+                json_dumps(account_id),
+                b',"cached_at":',
+                json_dumps(balance.cached_at),
+                b',"balance":',
+                balance.raw.encode(),
+                b"}",
             )
+        )
+        log_event(
+            "db.accounts.balance.response",
+            user_id=user.id,
+            account_id=account_id,
+            has_balance=balance.raw not in ("{}", "null"),
+        )
         self.set_no_cache(resp)
 
 
 class CachedTransactionsResource(BaseResource):
     def on_get(self, req: Request, resp: Response, account_id: str) -> None:
-        limit = 10
-        if "limit" in req.params:
-            try:
-                limit = max(1, min(100, int(req.params["limit"])))
-            except ValueError:
-                raise falcon.HTTPBadRequest("invalid-limit", "limit must be an integer")
+        try:
+            limit = req.get_param_as_int("limit", default=10)
+        except falcon.HTTPInvalidParam:
+            raise falcon.HTTPBadRequest("invalid-limit", "limit must be an integer")
+        # Out-of-range limits are clamped rather than rejected.
+        limit = max(1, min(100, limit))
+        fields = req.get_param("fields")
+        if fields is not None and fields != "summary":
+            raise falcon.HTTPBadRequest("invalid-fields", "fields must be 'summary' when provided")
 
         with self.session_scope() as session:
             repo = Repository(session)
@@ -205,22 +344,36 @@ class CachedTransactionsResource(BaseResource):
             account = repo.get_account(account_id)
             if not account or account.user_id != user.id:
                 raise falcon.HTTPNotFound()
-            transactions = repo.list_transactions(account.id, limit=limit)
-            resp.media = ensure_json_serializable(
-                {
-                    "account_id": account.id,
-                    "transactions": [tx.raw for tx in transactions],
-                    "cached_at": transactions[0].cached_at if transactions else None,
-                }
+            if fields == "summary":
+                transactions = repo.list_transaction_summaries(account.id, limit=limit)
+                payloads = json_dumps(
+                    [
+                        {"id": row.id, "date": row.date, "amount": row.amount, "description": row.description}
+                        for row in transactions
+                    ]
+                )
+            else:
+                transactions = repo.list_transaction_payloads(account.id, limit=limit)
+                # ``raw`` is the stored JSON text; splice it in as-is.
+                payloads = b"[" + ",".join([row.raw for row in transactions]).encode() + b"]"
+            resp.content_type = falcon.MEDIA_JSON
+            resp.data = b"".join(
+                (
+                    b'{"account_id":',
+                    json_dumps(account.id),
+                    b',"transactions":',
+                    payloads,
+                    b',"cached_at":',
+                    json_dumps(transactions[0].cached_at if transactions else None),
+                    b"}",
+                )
             )
-            LOGGER.info(
-                "db.accounts.transactions.response %s",
-                {
-                    "user_id": user.id,
-                    "account_id": account.id,
-                    "transaction_count": len(transactions),
-                    "limit": limit,
-                },
+            log_event(
+                "db.accounts.transactions.response",
+                user_id=user.id,
+                account_id=account.id,
+                transaction_count=len(transactions),
+                limit=limit,
             )
         self.set_no_cache(resp)
 
@@ -230,16 +383,17 @@ class LiveBalanceResource(BaseResource):
         with self.session_scope() as session:
             repo = Repository(session)
             user = self.authenticate(req, repo)
-            account = repo.get_account(account_id)
-            if not account or account.user_id != user.id:
-                raise falcon.HTTPNotFound()
-            try:
-                balance = self.teller.get_account_balances(user.access_token, account.id)
-            except TellerAPIError as exc:
-                raise falcon.HTTPBadGateway(description=str(exc)) from exc
-            repo.update_balance(account, balance)
-            session.flush()
-            resp.media = ensure_json_serializable({"account_id": account.id, "balance": balance})
+            self.owned_account(repo, account_id, user)
+        # The Teller round-trip runs without a pooled DB connection checked
+        # out, so slow upstream calls cannot starve other requests of one.
+        try:
+            balance = self.teller.get_account_balances(user.access_token, account_id)
+        except TellerAPIError as exc:
+            raise falcon.HTTPBadGateway(description=str(exc)) from exc
+        with self.session_scope() as session:
+            repo = Repository(session)
+            repo.update_balance(self.owned_account(repo, account_id, user), balance)
+        resp.media = {"account_id": account_id, "balance": balance}
         self.set_no_cache(resp)
 
 
@@ -255,21 +409,18 @@ class LiveTransactionsResource(BaseResource):
         with self.session_scope() as session:
             repo = Repository(session)
             user = self.authenticate(req, repo)
-            account = repo.get_account(account_id)
-            if not account or account.user_id != user.id:
-                raise falcon.HTTPNotFound()
-            try:
-                transactions = list(self.teller.get_account_transactions(user.access_token, account.id, count=count))
-            except TellerAPIError as exc:
-                raise falcon.HTTPBadGateway(description=str(exc)) from exc
-            repo.replace_transactions(account, transactions)
-            session.flush()
-            resp.media = ensure_json_serializable(
-                {
-                    "account_id": account.id,
-                    "transactions": transactions,
-                }
-            )
+            self.owned_account(repo, account_id, user)
+        try:
+            transactions = self.teller.get_account_transactions(user.access_token, account_id, count=count)
+        except TellerAPIError as exc:
+            raise falcon.HTTPBadGateway(description=str(exc)) from exc
+        with self.session_scope() as session:
+            repo = Repository(session)
+            repo.replace_transactions(self.owned_account(repo, account_id, user), transactions)
+        resp.media = {
+            "account_id": account_id,
+            "transactions": transactions,
+        }
         self.set_no_cache(resp)
 
 
@@ -293,36 +444,72 @@ class WebhookResource:
     allowing multiple secrets.
     """
 
+    # Teller webhook payloads are small; anything larger is rejected unread.
+    max_body_bytes = 1024 * 1024
+
     def __init__(self, signing_secrets: List[str], tolerance_seconds: int = 180) -> None:
         self.secrets = [s for s in (signing_secrets or []) if s]
         self.tolerance_seconds = tolerance_seconds
+        # Deliveries already handled, keyed by (event id, signature timestamp).
+        # Entries outlive the tolerance window, after which the staleness
+        # check rejects the replay anyway.
+        self._seen: TTLCache = TTLCache(maxsize=10_000, ttl=max(tolerance_seconds, 1) * 2)
+        # Keyed HMAC states are built once; each verification copies one and
+        # feeds it only the message, skipping the per-request key schedule.
+        self._hmac_prototypes = [hmac.new(s.encode("utf-8"), digestmod=hashlib.sha256) for s in self.secrets]
+        self._handlers: Dict[str, Callable[[Any, Dict[str, Any]], Dict[str, Any]]] = {
+            "webhook.test": self._handle_test,
+            "enrollment.disconnected": self._handle_enrollment_disconnected,
+            "transactions.processed": self._handle_transactions_processed,
+            "account.number_verification.processed": self._handle_number_verification_processed,
+        }
 
     @staticmethod
-    def _parse_signature_header(header: str) -> Tuple[int, List[str]]:
-        """Parse `Teller-Signature` header into (timestamp, [v1 signatures])."""
+    def _parse_signature_header(header: str) -> Tuple[int, List[bytes]]:
+        """Parse `Teller-Signature` header into (timestamp, [v1 signature digests]).
+
+        Signatures are decoded from hex so they can be compared with raw HMAC
+        digests; entries that are not valid hex could never match and are
+        dropped.
+        """
         if not header:
             raise falcon.HTTPUnauthorized("missing-signature", "Teller-Signature header required")
 
         timestamp: Optional[int] = None
-        sigs: List[str] = []
-        for part in header.split(","):
-            part = part.strip()
-            if not part or "=" not in part:
+        sigs: List[bytes] = []
+        # Walk the comma-separated parts by offset instead of splitting the
+        # header into a list first.
+        start = 0
+        end = len(header)
+        while start < end:
+            comma = header.find(",", start)
+            if comma < 0:
+                comma = end
+            k, sep, v = header[start:comma].strip().partition("=")
+            start = comma + 1
+            if not sep:
                 continue
-            k, v = part.split("=", 1)
             if k == "t":
                 try:
                     timestamp = int(v)
                 except ValueError:
                     raise falcon.HTTPBadRequest("invalid-signature", "invalid timestamp in signature header")
-            elif k == "v1":
-                if v:
-                    sigs.append(v)
+            elif k == "v1" and v:
+                try:
+                    sigs.append(bytes.fromhex(v))
+                except ValueError:
+                    continue
         if timestamp is None or not sigs:
             raise falcon.HTTPUnauthorized("invalid-signature", "missing timestamp or signature")
         return timestamp, sigs
 
-    def _verify(self, header: str, raw_body: bytes) -> None:
+    def _check_header(self, header: str) -> Tuple[int, List[bytes]]:
+        """Validate everything that does not need the body.
+
+        Runs before the body is read or hashed, so unconfigured endpoints,
+        malformed headers and replayed (stale) deliveries are rejected with
+        only integer work.
+        """
         if not self.secrets:
             raise falcon.HTTPInternalServerError(
                 title="webhook-not-configured",
@@ -335,17 +522,20 @@ class WebhookResource:
         now = int(time.time())
         if abs(now - timestamp) > self.tolerance_seconds:
             raise falcon.HTTPUnauthorized("stale-signature", "signature timestamp too old")
+        return timestamp, signatures
 
-        # Create the signed message: "{timestamp}.{raw_json_body}"
-        try:
-            body_text = raw_body.decode("utf-8")
-        except Exception:
-            raise falcon.HTTPBadRequest("invalid-body", "payload must be utf-8 JSON")
-        message = f"{timestamp}.{body_text}".encode("utf-8")
+    def _verify(self, timestamp: int, signatures: List[bytes], raw_body: bytes) -> None:
+        # The signed message is b"{timestamp}.{raw_json_body}"; feed it in two
+        # parts so the body bytes are hashed in place. Invalid UTF-8 is
+        # rejected later by the JSON parser.
+        prefix = b"%d." % timestamp
 
         # Validate against any configured secret (supports rotation)
-        for secret in self.secrets:
-            digest = hmac.new(secret.encode("utf-8"), message, hashlib.sha256).hexdigest()
+        for prototype in self._hmac_prototypes:
+            mac = prototype.copy()
+            mac.update(prefix)
+            mac.update(raw_body)
+            digest = mac.digest()
             for provided in signatures:
                 if hmac.compare_digest(digest, provided):
                     return
@@ -353,15 +543,19 @@ class WebhookResource:
         raise falcon.HTTPUnauthorized("signature-mismatch", "no matching signature")
 
     def on_post(self, req: Request, resp: Response) -> None:
-        # Read raw body once; use for verification and JSON parsing
-        raw = req.bounded_stream.read() or b""
+        content_length = req.content_length or 0
+        if content_length > self.max_body_bytes:
+            raise falcon.HTTPPayloadTooLarge(description="webhook payload too large")
+        timestamp, signatures = self._check_header(req.get_header("Teller-Signature"))
 
-        sig_header = req.get_header("Teller-Signature")
-        self._verify(sig_header, raw)
+        # Read raw body once, sized from Content-Length; use for verification
+        # and JSON parsing
+        raw = req.bounded_stream.read(content_length) if content_length else b""
+        self._verify(timestamp, signatures, raw)
 
         try:
-            event = json.loads(raw.decode("utf-8") or "{}")
-        except json.JSONDecodeError:
+            event = orjson.loads(raw or b"{}")
+        except orjson.JSONDecodeError:
             raise falcon.HTTPBadRequest("invalid-json", "unable to parse webhook payload")
 
         event_id = event.get("id")
@@ -369,29 +563,48 @@ class WebhookResource:
         payload = event.get("payload") or {}
 
         # Minimal processing + logging. Business logic can be extended here.
-        LOGGER.info(
-            "webhook.received %s",
-            ensure_json_serializable({"id": event_id, "type": event_type, "payload_keys": list(payload.keys())}),
-        )
+        log_event("webhook.received", id=event_id, type=event_type, payload_keys=list(payload.keys()))
 
+        resp.set_header("Cache-Control", "no-store")
         # Handle known types with no-op side effects for now.
-        if event_type == "webhook.test":
-            resp.media = {"ok": True, "echo": event_id}
-        elif event_type == "enrollment.disconnected":
-            # payload: { enrollment_id, reason }
-            LOGGER.warning("enrollment.disconnected %s", ensure_json_serializable(payload))
-            resp.media = {"ok": True}
-        elif event_type == "transactions.processed":
-            # payload: { transactions: [...] }
-            tx_count = len(payload.get("transactions", []))
-            LOGGER.info("transactions.processed count=%d", tx_count)
-            resp.media = {"ok": True, "processed": tx_count}
-        elif event_type == "account.number_verification.processed":
-            # payload: { account_id, status }
-            LOGGER.info("account.number_verification.processed %s", ensure_json_serializable(payload))
-            resp.media = {"ok": True}
-        else:
+        handler = self._handlers.get(event_type) if isinstance(event_type, str) else None
+        if handler is None:
             LOGGER.info("webhook.unknown_type %s", event_type)
             resp.media = {"ok": True, "ignored": True}
+            return
 
-        resp.set_header("Cache-Control", "no-store")
+        delivery_key = (event_id, timestamp) if isinstance(event_id, str) else None
+        if delivery_key is not None and not self._seen.add(delivery_key, True):
+            log_event("webhook.duplicate", id=event_id, type=event_type)
+            resp.media = {"ok": True, "duplicate": True}
+            return
+        try:
+            resp.media = handler(event_id, payload)
+        except Exception:
+            # Let a redelivery of a failed event be processed again.
+            if delivery_key is not None:
+                self._seen.discard(delivery_key)
+            raise
+
+    @staticmethod
+    def _handle_test(event_id: Any, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "echo": event_id}
+
+    @staticmethod
+    def _handle_enrollment_disconnected(event_id: Any, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # payload: { enrollment_id, reason }
+        log_event("enrollment.disconnected", level=logging.WARNING, payload=payload)
+        return {"ok": True}
+
+    @staticmethod
+    def _handle_transactions_processed(event_id: Any, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # payload: { transactions: [...] }
+        tx_count = len(payload.get("transactions", []))
+        LOGGER.info("transactions.processed count=%d", tx_count)
+        return {"ok": True, "processed": tx_count}
+
+    @staticmethod
+    def _handle_number_verification_processed(event_id: Any, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # payload: { account_id, status }
+        log_event("account.number_verification.processed", payload=payload)
+        return {"ok": True}
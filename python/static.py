@@ -0,0 +1,274 @@
+"""Falcon resources serving the bundled frontend assets."""
+from __future__ import annotations
+
+import functools
+import gzip
+import mimetypes
+import os
+import pathlib
+import re
+import stat
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable, Dict, NamedTuple, Optional, Tuple
+
+import falcon
+
+try:  # Brotli is optional; gzip alone is served when it isn't installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Files up to this size are kept in memory once read; larger files are
+# streamed from disk on every request.
+STATIC_CACHE_MAX_BYTES = 256 * 1024
+# Loaded files and compressed variants kept per process. Sized well above the
+# bundled asset set so steady-state requests never reload or recompress.
+STATIC_CACHE_MAX_FILES = 512
+
+_CACHE_CONTROL = "public, max-age=3600"
+# Names carrying a content hash (``app.3f9a1c2e.js``) change whenever their
+# content does, so browsers may keep them without revalidating.
+_CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+_FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{8,}\.")
+
+# Parse the system mime.types once at import and freeze the result, so the
+# static path never takes the ``mimetypes`` module lock. ``.js`` is pinned
+# because older Pythons map it to ``application/javascript``.
+mimetypes.init()
+mimetypes.add_type("text/javascript", ".js")
+_TYPE_MAP: Dict[str, str] = dict(mimetypes.types_map)
+
+_REFUSED_QVALUES = frozenset({"q=0", "q=0.0", "q=0.00", "q=0.000"})
+_UNSAFE_NAME_CHARS = ("/", "\\", "\x00")
+
+_COMPRESSIBLE_TYPES = frozenset({"application/javascript", "application/json", "application/xml", "image/svg+xml"})
+
+# In-memory codings in order of preference; brotli only when it is installed.
+_COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {}
+if brotli is not None:
+    _COMPRESSORS["br"] = functools.partial(brotli.compress, quality=11)
+_COMPRESSORS["gzip"] = functools.partial(gzip.compress, compresslevel=9, mtime=0)
+
+
+class StaticFile(NamedTuple):
+    """A static asset as it was on disk when loaded."""
+
+    path: str
+    content_type: Optional[str]
+    etag: str
+    last_modified: datetime
+    size: int
+    body: Optional[bytes]
+    # Whether the cached ``body`` is text worth compressing. Compressed
+    # variants are built on the first request that accepts them.
+    compressible: bool = False
+    # Pre-built ``<name>.gz`` sibling for files too large to cache.
+    gzip_path: Optional[str] = None
+
+
+@functools.lru_cache(maxsize=STATIC_CACHE_MAX_FILES)
+def _load_static(path: str, mtime_ns: int, size: int) -> StaticFile:
+    # ``mtime_ns`` and ``size`` are part of the cache key, so an edited file
+    # misses the cache and is reloaded without explicit invalidation.
+    content_type = _TYPE_MAP.get(os.path.splitext(path)[1].lower())
+    body = None
+    if size <= STATIC_CACHE_MAX_BYTES:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            body = os.read(fd, size)
+        finally:
+            os.close(fd)
+    compressible = body is not None and _is_compressible(content_type)
+    gzip_path = path + ".gz" if body is None and os.path.isfile(path + ".gz") else None
+    # HTTP dates have one-second resolution and are compared as naive UTC.
+    last_modified = datetime.fromtimestamp(mtime_ns // 1_000_000_000, timezone.utc).replace(tzinfo=None)
+    return StaticFile(
+        path, content_type, f"{size:x}-{mtime_ns:x}", last_modified, size, body, compressible, gzip_path
+    )
+
+
+@functools.lru_cache(maxsize=STATIC_CACHE_MAX_FILES)
+def _compressed_body(static_file: StaticFile, encoding: str) -> Optional[bytes]:
+    # Keyed on the loaded file, so an edited file gets fresh variants. ``None``
+    # records that the coding does not shrink this body.
+    compressed = _COMPRESSORS[encoding](static_file.body)
+    return compressed if len(compressed) < len(static_file.body) else None
+
+
+def _is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and (content_type.startswith("text/") or content_type in _COMPRESSIBLE_TYPES)
+
+
+def accepted_encodings(req: falcon.Request) -> Dict[str, bool]:
+    """Map each coding named in ``Accept-Encoding`` to whether it is allowed.
+
+    A coding listed with ``q=0`` maps to ``False``; ``*`` covers any coding
+    not named explicitly.
+    """
+
+    header = req.get_header("Accept-Encoding")
+    if not header:
+        return {}
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        accepted[coding.strip().lower()] = params.replace(" ", "").lower() not in _REFUSED_QVALUES
+    return accepted
+
+
+def _choose_encoding(req: falcon.Request, static_file: StaticFile) -> Tuple[Optional[str], Optional[bytes]]:
+    """Return the coding to send and, for cached bodies, its compressed bytes."""
+
+    accepted = accepted_encodings(req)
+    any_coding = accepted.get("*", False)
+    if static_file.compressible:
+        for coding in _COMPRESSORS:
+            if accepted.get(coding, any_coding):
+                data = _compressed_body(static_file, coding)
+                if data is not None:
+                    return coding, data
+    elif static_file.gzip_path is not None and accepted.get("gzip", any_coding):
+        return "gzip", None
+    return None, None
+
+
+def _not_modified(req: falcon.Request, etag: str, last_modified: datetime) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2);
+    # a weak comparison is used, so weak and strong forms of a tag both match.
+    if_none_match = req.if_none_match
+    if if_none_match is not None:
+        return "*" in if_none_match or etag in if_none_match
+    if_modified_since = req.if_modified_since
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def load_static(path: str) -> StaticFile:
+    """Return the cached :class:`StaticFile` for ``path``.
+
+    Raises ``falcon.HTTPNotFound`` when ``path`` is not a regular file.
+    """
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise falcon.HTTPNotFound()
+    if not stat.S_ISREG(st.st_mode):
+        raise falcon.HTTPNotFound()
+    try:
+        return _load_static(path, st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        # Removed between the stat and the read (e.g. mid-deploy).
+        raise falcon.HTTPNotFound() from None
+
+
+def send_static(req: falcon.Request, resp: falcon.Response, static_file: StaticFile) -> None:
+    """Write ``static_file`` to ``resp`` from memory or as a file stream.
+
+    A brotli or gzip variant is chosen, in that order, when the client
+    accepts it and it is smaller than the body; variants of cached bodies are
+    compressed on first use and kept.
+    Conditional requests whose validators still match get a bodyless 304.
+    Falcon passes file-like streams to ``wsgi.file_wrapper``, which lets
+    waitress send large files from disk without copying them through a bytes
+    object.
+    """
+
+    encoding = data = None
+    if static_file.compressible or static_file.gzip_path is not None:
+        resp.vary = ("Accept-Encoding",)
+        encoding, data = _choose_encoding(req, static_file)
+    etag = f"{static_file.etag}-{encoding}" if encoding else static_file.etag
+    resp.etag = f'W/"{etag}"'
+    resp.last_modified = static_file.last_modified
+    if _not_modified(req, etag, static_file.last_modified):
+        resp.status = falcon.HTTP_304
+        return
+    if static_file.content_type:
+        resp.content_type = static_file.content_type
+    if encoding is not None:
+        resp.set_header("Content-Encoding", encoding)
+        if data is not None:
+            resp.data = data
+        else:
+            stream = _open_stream(static_file.gzip_path)
+            resp.set_stream(stream, os.fstat(stream.fileno()).st_size)
+        return
+    if static_file.body is not None:
+        resp.data = static_file.body
+    else:
+        resp.set_stream(_open_stream(static_file.path), static_file.size)
+
+
+def _open_stream(path: str) -> BinaryIO:
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        raise falcon.HTTPNotFound() from None
+
+
+def _scan_files(root: str) -> Dict[str, str]:
+    """Map each regular file directly under ``root`` to its resolved path.
+
+    ``root`` must already be resolved. Symlinks are followed, and entries
+    whose target lies outside ``root`` are left out, so an indexed path is
+    always safe to serve.
+    """
+
+    root_prefix = root + os.sep
+    files = {}
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                path = os.path.realpath(entry.path)
+                if path.startswith(root_prefix):
+                    files[entry.name] = path
+    except FileNotFoundError:
+        pass
+    return files
+
+
+class IndexResource:
+    def __init__(self, static_root: pathlib.Path) -> None:
+        self.static_root = static_root.resolve()
+        self._index_path = os.path.join(self.static_root, "index.html")
+        # Load the page once at boot; each request then costs one stat to
+        # confirm the cached body still matches the file on disk.
+        try:
+            load_static(self._index_path)
+        except falcon.HTTPNotFound:
+            pass
+
+    def on_get(self, req: falcon.Request, resp: falcon.Response) -> None:
+        send_static(req, resp, load_static(self._index_path))
+        resp.set_header("Cache-Control", "public, max-age=60")
+
+
+class StaticResource:
+    def __init__(self, static_root: pathlib.Path) -> None:
+        self.static_root = static_root.resolve()
+        self._root = str(self.static_root)
+        self._root_prefix = self._root + os.sep
+        # The route only matches a single path segment, so the servable set is
+        # the regular files directly under the root. Vetting them once here
+        # turns the per-request traversal check into a dict lookup. Files are
+        # read, and compressed, on first request rather than at startup.
+        self._index = _scan_files(self._root)
+
+    def on_get(self, req: falcon.Request, resp: falcon.Response, filename: str) -> None:
+        full_path = self._index.get(filename)
+        if full_path is None:
+            # Only direct children of the root are servable, so any name with
+            # a separator or NUL is rejected before touching the filesystem.
+            if filename in (".", "..") or any(c in filename for c in _UNSAFE_NAME_CHARS):
+                raise falcon.HTTPNotFound()
+            # Files added after startup go through the same traversal guard
+            # the index applied at boot.
+            full_path = os.path.realpath(os.path.join(self._root, filename))
+            if not full_path.startswith(self._root_prefix):
+                raise falcon.HTTPNotFound()
+        send_static(req, resp, load_static(full_path))
+        resp.set_header(
+            "Cache-Control", _CACHE_CONTROL_IMMUTABLE if _FINGERPRINT_RE.search(filename) else _CACHE_CONTROL
+        )
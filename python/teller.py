@@ -2,25 +2,14 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import logging
-import mimetypes
 import os
 import pathlib
 from typing import Optional
 import base64
 
 import falcon
-try:  # Load .env in local development if available
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except Exception:
-    # It's safe to proceed if python-dotenv isn't installed or .env is missing
-    pass
-
-from waitress import serve
-from alembic.config import Config as AlembicConfig
-from alembic import command as alembic_command
 
 try:
     from . import db, models
@@ -33,7 +22,9 @@ try:
         LiveBalanceResource,
         LiveTransactionsResource,
     )
+    from .static import IndexResource, StaticResource
     from .teller_api import TellerClient
+    from .utils import install_json_handler, json_dumps
 except ImportError:  # pragma: no cover - fallback when executed as a script
     import sys
 
@@ -49,10 +40,17 @@ except ImportError:  # pragma: no cover - fallback when executed as a script
         LiveBalanceResource,
         LiveTransactionsResource,
     )  # type: ignore
+    from python.static import IndexResource, StaticResource  # type: ignore
     from python.teller_api import TellerClient  # type: ignore
+    from python.utils import install_json_handler, json_dumps  # type: ignore
+
 
 def run_migrations() -> None:
     """Run Alembic migrations to upgrade database to latest version."""
+    # Imported here so serving the app never pays for loading Alembic.
+    from alembic import command as alembic_command
+    from alembic.config import Config as AlembicConfig
+
     alembic_cfg = AlembicConfig("alembic.ini")
     alembic_command.upgrade(alembic_cfg, "head")
     LOGGER.info("Database migrations completed successfully")
@@ -62,51 +60,47 @@ def run_migrations() -> None:
 LOGGER = logging.getLogger(__name__)
 
 
-class IndexResource:
-    def __init__(self, static_root: pathlib.Path) -> None:
-        self.static_root = static_root.resolve()
-
-    def on_get(self, req: falcon.Request, resp: falcon.Response) -> None:
-        path = self.static_root / "index.html"
-        if not path.exists():
-            raise falcon.HTTPNotFound()
-        resp.content_type = "text/html"
-        resp.data = path.read_bytes()
-        resp.set_header("Cache-Control", "public, max-age=60")
-
-
-class StaticResource:
-    def __init__(self, static_root: pathlib.Path) -> None:
-        self.static_root = static_root.resolve()
-
-    def on_get(self, req: falcon.Request, resp: falcon.Response, filename: str) -> None:
-        safe_path = pathlib.Path(filename)
-        full_path = (self.static_root / safe_path).resolve()
-        if not str(full_path).startswith(str(self.static_root.resolve())) or not full_path.exists():
-            raise falcon.HTTPNotFound()
-        content_type, _ = mimetypes.guess_type(full_path.name)
-        if content_type:
-            resp.content_type = content_type
-        resp.data = full_path.read_bytes()
-        resp.set_header("Cache-Control", "public, max-age=3600")
+# Resources constructed with ``(session_factory, teller_client)``.
+API_ROUTES = (
+    ("/api/connect/token", ConnectTokenResource),
+    ("/api/enrollments", EnrollmentResource),
+    ("/api/db/accounts", AccountsResource),
+    ("/api/db/accounts/{account_id}/balances", CachedBalanceResource),
+    ("/api/db/accounts/{account_id}/transactions", CachedTransactionsResource),
+    ("/api/accounts/{account_id}/balances", LiveBalanceResource),
+    ("/api/accounts/{account_id}/transactions", LiveTransactionsResource),
+)
 
 
 class HealthResource:
     def __init__(self, environment: str) -> None:
         self.environment = environment
+        # Load balancers poll this endpoint, so serialize the fixed payload once.
+        self._body = json_dumps({"status": "ok", "environment": environment})
 
     def on_get(self, req: falcon.Request, resp: falcon.Response) -> None:
-        resp.media = {"status": "ok", "environment": self.environment}
+        resp.content_type = falcon.MEDIA_JSON
+        resp.data = self._body
         resp.set_header("Cache-Control", "no-store")
 
 
 class ConfigResource:
     def __init__(self, config: dict[str, str]) -> None:
         self.config = config
+        self._body = json_dumps(config)
+        self._etag = hashlib.blake2b(self._body, digest_size=16).hexdigest()
 
     def on_get(self, req: falcon.Request, resp: falcon.Response) -> None:
-        resp.media = self.config
-        resp.set_header("Cache-Control", "no-store")
+        # The config only changes on redeploy, so let clients keep it and
+        # revalidate instead of refetching the body on every page load.
+        resp.etag = self._etag
+        resp.set_header("Cache-Control", "no-cache")
+        if_none_match = req.if_none_match
+        if if_none_match is not None and ("*" in if_none_match or self._etag in if_none_match):
+            resp.status = falcon.HTTP_304
+            return
+        resp.content_type = falcon.MEDIA_JSON
+        resp.data = self._body
 
 
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
@@ -128,6 +122,36 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     #     default=os.getenv("TELLER_PRIVATE_KEY"),
     # )
     parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8001")))
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(os.getenv("WAITRESS_THREADS", str(max(4, (os.cpu_count() or 2) * 2)))),
+        help="Waitress worker threads; handlers block on Teller and the database",
+    )
+    parser.add_argument(
+        "--connection-limit",
+        type=int,
+        default=int(os.getenv("WAITRESS_CONNECTION_LIMIT", "100")),
+        help="Maximum simultaneous client connections accepted by waitress",
+    )
+    parser.add_argument(
+        "--outbuf-high-watermark",
+        type=int,
+        default=int(os.getenv("WAITRESS_OUTBUF_HIGH_WATERMARK", str(16 * 1024 * 1024))),
+        help="Bytes of pending output before waitress pauses the response iterator",
+    )
+    parser.add_argument(
+        "--serve-static",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("SERVE_STATIC", "true").lower() not in {"0", "false", "no"},
+        help="Serve / and /static/ from this process; disable when a reverse proxy serves them",
+    )
+    parser.add_argument(
+        "--warm-pool",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("DB_WARM_POOL", "true").lower() not in {"0", "false", "no"},
+        help="Open the database pool's connections before serving the first request",
+    )
     parser.add_argument("--debug", action="store_true")
     parser.add_argument("--db-echo", action="store_true")
     parser.add_argument(
@@ -181,16 +205,34 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     return args
 
 
+def configure_logging(debug: bool = False, db_echo: bool = False) -> None:
+    """Set up root logging and quiet library loggers on the request path."""
+
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+    # Records never format thread or process fields, so skip looking them up.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.getLogger("waitress").setLevel(logging.WARNING)
+    if not db_echo:
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+
 def create_app(args: argparse.Namespace) -> falcon.App:
-    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    configure_logging(debug=args.debug, db_echo=args.db_echo)
 
     engine = db.create_db_engine(echo=args.db_echo)
-    
-    # Schema is now managed by Alembic migrations.
-    # Run `alembic upgrade head` to apply migrations before starting the app.
-    # In development, SQLite will auto-create tables on first access if needed.
+    # Only the server asks for this; apps built by tests and tools connect on
+    # first use.
+    if getattr(args, "warm_pool", False):
+        db.warm_pool(engine)
+
+    # Schema is managed by Alembic migrations and is never created here, so
+    # startup issues no per-table existence checks. Run
+    # `python python/teller.py migrate` (or `alembic upgrade head`) before
+    # starting the app, including against a fresh local SQLite database.
     # For production/Render, migrations must be run via job or manual command.
-    
+
     session_factory = db.create_session_factory(engine)
 
     certificate_path = "/etc/secrets/certificate.pem"
@@ -206,9 +248,11 @@ def create_app(args: argparse.Namespace) -> falcon.App:
     static_root = pathlib.Path(__file__).resolve().parent.parent / "static"
 
     app = falcon.App()
+    install_json_handler(app)
 
-    app.add_route("/", IndexResource(static_root))
-    app.add_route("/static/{filename}", StaticResource(static_root))
+    if getattr(args, "serve_static", True):
+        app.add_route("/", IndexResource(static_root))
+        app.add_route("/static/{filename}", StaticResource(static_root))
 
     runtime_config = {
         "applicationId": args.application_id,
@@ -218,25 +262,8 @@ def create_app(args: argparse.Namespace) -> falcon.App:
 
     app.add_route("/api/healthz", HealthResource(args.environment))
     app.add_route("/api/config", ConfigResource(runtime_config))
-    app.add_route("/api/connect/token", ConnectTokenResource(session_factory, teller_client))
-    app.add_route("/api/enrollments", EnrollmentResource(session_factory, teller_client))
-    app.add_route("/api/db/accounts", AccountsResource(session_factory, teller_client))
-    app.add_route(
-        "/api/db/accounts/{account_id}/balances",
-        CachedBalanceResource(session_factory, teller_client),
-    )
-    app.add_route(
-        "/api/db/accounts/{account_id}/transactions",
-        CachedTransactionsResource(session_factory, teller_client),
-    )
-    app.add_route(
-        "/api/accounts/{account_id}/balances",
-        LiveBalanceResource(session_factory, teller_client),
-    )
-    app.add_route(
-        "/api/accounts/{account_id}/transactions",
-        LiveTransactionsResource(session_factory, teller_client),
-    )
+    for uri_template, resource_cls in API_ROUTES:
+        app.add_route(uri_template, resource_cls(session_factory, teller_client))
 
     # Webhooks: attempt to import resource dynamically to avoid hard import failures
     WebhookResource = None
@@ -269,7 +296,20 @@ def create_app(args: argparse.Namespace) -> falcon.App:
     return app
 
 
+def load_env_file() -> None:
+    """Load ``.env`` in local development if python-dotenv is available."""
+
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    except Exception:
+        # It's safe to proceed if python-dotenv isn't installed or .env is missing
+        pass
+
+
 def main(argv: Optional[list[str]] = None) -> None:
+    load_env_file()
     # Check if first argument is 'migrate' command (important-comment)
     import sys
     args_to_check = argv if argv is not None else sys.argv[1:]
@@ -283,8 +323,17 @@ def main(argv: Optional[list[str]] = None) -> None:
     args = parse_args(argv)
     app = create_app(args)
 
+    from waitress import serve
+
     LOGGER.info("Listening on http://0.0.0.0:%s", args.port)
-    serve(app, host="0.0.0.0", port=args.port)
+    serve(
+        app,
+        host="0.0.0.0",
+        port=args.port,
+        threads=args.threads,
+        connection_limit=args.connection_limit,
+        outbuf_high_watermark=args.outbuf_high_watermark,
+    )
 
 
 if __name__ == "__main__":
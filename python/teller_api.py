@@ -2,18 +2,44 @@
 from __future__ import annotations
 
 import base64
+import functools
 import logging
 import os
 import tempfile
 import atexit
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 LOGGER = logging.getLogger(__name__)
 
 BASE_URL = "https://api.teller.io"
 
+# Keep-alive connections retained per client; sized to cover the enrollment
+# priming fan-out so concurrent calls reuse TLS sessions instead of reconnecting.
+POOL_MAXSIZE = 16
+
+# Transient gateway errors on reads are retried on the pooled connection;
+# POSTs are never retried because token creation is not idempotent. Only
+# status codes are retried: connection errors and read timeouts fail on the
+# first attempt, so a hung endpoint holds a worker for one timeout, not three.
+# ``Retry-After`` is ignored because urllib3 would sleep for whatever the
+# upstream asks, outside the request timeout; retries use the short backoff.
+RETRY = Retry(
+    total=2,
+    connect=0,
+    read=0,
+    other=0,
+    respect_retry_after_header=False,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    raise_on_status=False,
+)
+
 
 class TellerAPIError(RuntimeError):
     """Raised when the Teller API returns an error."""
@@ -46,31 +72,9 @@ class TellerClient:
                 self.cert_tuple = (certificate, private_key)
             else:
                 # Assume they are content and write to temporary files
-                def _normalize_pem(text: str) -> str:
-                    # Convert literal \n to newlines if present and looks like PEM
-                    if "-----BEGIN" in text and "\\n" in text:
-                        text = text.replace("\\n", "\n")
-                    # Ensure trailing newline
-                    if not text.endswith("\n"):
-                        text += "\n"
-                    return text
-
-                cert_text = _normalize_pem(certificate)
-                key_text = _normalize_pem(private_key)
-
-                cert_file = tempfile.NamedTemporaryFile(delete=False)
-                cert_file.write(cert_text.encode())
-                cert_file.close()
-
-                key_file = tempfile.NamedTemporaryFile(delete=False)
-                key_file.write(key_text.encode())
-                key_file.close()
-
-                self.cert_tuple = (cert_file.name, key_file.name)
+                self.cert_tuple = _materialize_cert(_normalize_pem(certificate), _normalize_pem(private_key))
 
-                # Register cleanup for temporary files
-                atexit.register(os.remove, cert_file.name)
-                atexit.register(os.remove, key_file.name)
+        self._session = _build_session(self.cert_tuple)
 
     # ---------------- Connect ---------------- #
     def create_connect_token(self, **kwargs) -> Dict[str, Any]:
@@ -82,17 +86,16 @@ class TellerClient:
 
         payload = {"application_id": self.application_id}
         payload.update(kwargs)
-        response = requests.post(
+        response = self._session.post(
             f"{BASE_URL}/connect/token",
             json=payload,
             headers={"Content-Type": "application/json"},
-            cert=self.cert_tuple,
             timeout=15,
         )
         return _handle_response(response)
 
     # ---------------- Accounts ---------------- #
-    def list_accounts(self, access_token: str) -> Iterable[Dict[str, Any]]:
+    def list_accounts(self, access_token: str) -> List[Dict[str, Any]]:
         return self._get(access_token, "/accounts")
 
     def get_account_balances(self, access_token: str, account_id: str) -> Dict[str, Any]:
@@ -103,7 +106,7 @@ class TellerClient:
         access_token: str,
         account_id: str,
         count: Optional[int] = None,
-    ) -> Iterable[Dict[str, Any]]:
+    ) -> List[Dict[str, Any]]:
         path = f"/accounts/{account_id}/transactions"
         params = {"count": count} if count is not None else None
         return self._get(access_token, path, params=params)
@@ -116,15 +119,62 @@ class TellerClient:
         params: Optional[Dict[str, Any]] = None,
     ) -> Any:
         url = f"{BASE_URL}{path}"
-        headers = {
-            "Authorization": _bearer_to_basic(access_token),
-            "Accept": "application/json",
-        }
+        headers = {"Authorization": _bearer_to_basic(access_token)}
         LOGGER.debug("GET %s params=%s", url, params)
-        resp = requests.get(url, headers=headers, params=params, cert=self.cert_tuple, timeout=15)
+        resp = self._session.get(url, headers=headers, params=params, timeout=15)
         return _handle_response(resp)
 
 
+def _normalize_pem(text: str) -> str:
+    # Convert literal \n to newlines if present and looks like PEM
+    if "-----BEGIN" in text and "\\n" in text:
+        text = text.replace("\\n", "\n")
+    # Ensure trailing newline
+    if not text.endswith("\n"):
+        text += "\n"
+    return text
+
+
+@functools.lru_cache(maxsize=4)
+def _materialize_cert(cert_text: str, key_text: str) -> Tuple[str, str]:
+    """Write a PEM pair to owner-only temp files once per process.
+
+    Clients built from the same contents share the files, so constructing
+    another client neither rewrites them nor registers more cleanup hooks.
+    """
+
+    paths = (_write_private_file(cert_text, ".crt"), _write_private_file(key_text, ".key"))
+    atexit.register(_remove_files, paths)
+    return paths
+
+
+def _write_private_file(text: str, suffix: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=suffix)  # created with mode 0600
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(text.encode())
+    return path
+
+
+def _remove_files(paths: Tuple[str, ...]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _build_session(cert: Optional[tuple]) -> requests.Session:
+    """Create a keep-alive session carrying the client certificate."""
+
+    session = requests.Session()
+    session.cert = cert
+    session.headers["Accept"] = "application/json"
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=RETRY)
+    session.mount(BASE_URL, adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=512)
 def _bearer_to_basic(token: str) -> str:
     token = token.strip()
     if token.lower().startswith("basic "):
@@ -137,8 +187,8 @@ def _bearer_to_basic(token: str) -> str:
 
 def _handle_response(response: requests.Response):
     try:
-        payload = response.json()
-    except ValueError:
+        payload = orjson.loads(response.content)
+    except orjson.JSONDecodeError:
         payload = response.text
 
     if not response.ok:
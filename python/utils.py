@@ -1,30 +1,125 @@
 """Shared helpers for Falcon resources."""
 from __future__ import annotations
 
-import datetime as dt
+import threading
+import time
+from collections import OrderedDict
 from decimal import Decimal
-from typing import Any
+from typing import Any, Callable, Hashable, Optional, Tuple
 
+import orjson
+from falcon.media import JSONHandler
 
-def to_serializable(value: Any):
-    """Convert SQLAlchemy values to JSON serializable data."""
 
-    if isinstance(value, dt.datetime):
-        return value.isoformat()
-    if isinstance(value, dt.date):
-        return value.isoformat()
+def _json_default(value: Any) -> Any:
+    # orjson encodes datetimes, dates, dicts and lists natively; only types it
+    # does not know reach this hook.
     if isinstance(value, Decimal):
         return float(value)
-    if isinstance(value, dict):
-        return {k: to_serializable(v) for k, v in value.items()}
-    if isinstance(value, (list, tuple)):
-        return [to_serializable(v) for v in value]
-    return value
-
-
-def ensure_json_serializable(data: Any) -> Any:
-    if isinstance(data, dict):
-        return {k: ensure_json_serializable(v) for k, v in data.items()}
-    if isinstance(data, list):
-        return [ensure_json_serializable(v) for v in data]
-    return to_serializable(data)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _log_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def json_dumps(data: Any) -> bytes:
+    """Encode ``data`` as JSON bytes; ``Decimal`` values become floats."""
+
+    return orjson.dumps(data, default=_json_default)
+
+
+def log_json(data: Any) -> str:
+    """Encode a log record as JSON text, stringifying any unknown value."""
+
+    return orjson.dumps(data, default=_log_default).decode()
+
+
+# Falcon media handler used for both request parsing and ``resp.media``.
+JSON_HANDLER = JSONHandler(dumps=json_dumps, loads=orjson.loads)
+
+
+def install_json_handler(app) -> None:
+    """Route ``application/json`` media on ``app`` through orjson."""
+
+    app.req_options.media_handlers["application/json"] = JSON_HANDLER
+    app.resp_options.media_handlers["application/json"] = JSON_HANDLER
+
+
+class TTLCache:
+    """Small thread-safe LRU mapping whose entries expire ``ttl`` seconds after insert.
+
+    When ``maxsize`` is reached expired entries are purged first, then the
+    least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= self._timer():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (self._timer() + self.ttl, value)
+
+    def add(self, key: Hashable, value: Any) -> bool:
+        """Store ``value`` only if ``key`` is absent or expired; return whether it was stored.
+
+        The check and the insert happen under one lock, so concurrent callers
+        racing on the same key see exactly one ``True``.
+        """
+
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > self._timer():
+                return False
+            if item is None and len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            return True
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> None:
+        """Drop every entry whose value matches ``predicate``."""
+
+        with self._lock:
+            for key in [key for key, (_, value) in self._data.items() if predicate(value)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict(self) -> None:
+        now = self._timer()
+        for key in [key for key, (expires_at, _) in self._data.items() if expires_at <= now]:
+            del self._data[key]
+        if len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
@@ -3,7 +3,7 @@ import os
 import sys
 from pathlib import Path
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 repo_root = Path(__file__).resolve().parent.parent
@@ -12,6 +12,7 @@ if str(repo_root) not in sys.path:
 
 from python import models, db
 from python.repository import Repository
+from python.resources import _TOKEN_CACHE
 
 
 @pytest.fixture(scope="session")
@@ -23,7 +24,7 @@ def database_url():
 @pytest.fixture(scope="session")
 def engine(database_url):
     """Create database engine for tests."""
-    return create_engine(
+    engine = create_engine(
         database_url,
         echo=False,
         future=True,
@@ -32,6 +33,25 @@ def engine(database_url):
         max_overflow=5,
         pool_recycle=300,
     )
+    if engine.dialect.name == "sqlite":
+        _enable_sqlite_savepoints(engine)
+    return engine
+
+
+def _enable_sqlite_savepoints(engine):
+    """Have pysqlite emit BEGIN when SQLAlchemy begins a transaction.
+
+    The driver otherwise defers BEGIN until the first DML statement, so a
+    SAVEPOINT would open the transaction itself and releasing it would commit.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
 
 @pytest.fixture(scope="session")
@@ -42,9 +62,29 @@ def setup_database(engine):
 
 
 @pytest.fixture
-def session_factory(engine, setup_database):
+def connection(engine, setup_database):
+    """Open one transaction per test and roll it back at teardown.
+
+    Sessions bound to it run their own transactions as SAVEPOINTs, so tests
+    may commit freely without leaving rows behind for later tests.
+    """
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            yield connection
+        finally:
+            transaction.rollback()
+
+
+@pytest.fixture
+def session_factory(connection):
     """Create a session factory for tests."""
-    return sessionmaker(bind=engine, expire_on_commit=False, future=True)
+    return sessionmaker(
+        bind=connection,
+        expire_on_commit=False,
+        future=True,
+        join_transaction_mode="create_savepoint",
+    )
 
 
 @pytest.fixture
@@ -65,3 +105,11 @@ def session(session_factory):
 def repo(session):
     """Create a repository instance for each test."""
     return Repository(session)
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Forget authenticated tokens whose rows a previous test rolled back."""
+    _TOKEN_CACHE.clear()
+    yield
+    _TOKEN_CACHE.clear()
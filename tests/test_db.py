@@ -0,0 +1,23 @@
+"""Database setup helper tests."""
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from python import db
+
+
+def _pooled_engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=3)
+
+
+def test_warm_pool_opens_pool_size_connections(tmp_path):
+    engine = _pooled_engine(tmp_path)
+
+    assert db.warm_pool(engine, timeout=10) == 3
+    assert engine.pool.checkedin() == 3
+
+
+def test_warm_pool_stops_at_deadline(tmp_path):
+    engine = _pooled_engine(tmp_path)
+
+    assert db.warm_pool(engine, timeout=0) == 0
+    assert engine.pool.checkedin() == 0
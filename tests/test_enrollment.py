@@ -0,0 +1,203 @@
+"""Enrollment priming tests using a stubbed Teller client."""
+import falcon
+import pytest
+from falcon import testing
+
+from python.repository import Repository
+from python.resources import (
+    AccountsResource,
+    CachedBalanceResource,
+    CachedTransactionsResource,
+    EnrollmentResource,
+    LiveBalanceResource,
+    LiveTransactionsResource,
+)
+from python.teller_api import TellerAPIError
+from python.utils import install_json_handler
+
+
+class StubTellerClient:
+    def __init__(self, accounts, balances, transactions):
+        self.accounts = accounts
+        self.balances = balances
+        self.transactions = transactions
+
+    def list_accounts(self, access_token):
+        return list(self.accounts)
+
+    def get_account_balances(self, access_token, account_id):
+        result = self.balances[account_id]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_account_transactions(self, access_token, account_id, count=None):
+        result = self.transactions[account_id]
+        if isinstance(result, Exception):
+            raise result
+        return result[:count]
+
+
+def _client(session_factory, teller):
+    app = falcon.App()
+    install_json_handler(app)
+    app.add_route("/api/enrollments", EnrollmentResource(session_factory, teller))
+    app.add_route("/api/db/accounts", AccountsResource(session_factory, teller))
+    app.add_route("/api/db/accounts/{account_id}/balances", CachedBalanceResource(session_factory, teller))
+    app.add_route(
+        "/api/db/accounts/{account_id}/transactions",
+        CachedTransactionsResource(session_factory, teller),
+    )
+    app.add_route("/api/accounts/{account_id}/balances", LiveBalanceResource(session_factory, teller))
+    app.add_route("/api/accounts/{account_id}/transactions", LiveTransactionsResource(session_factory, teller))
+    return testing.TestClient(app)
+
+
+def test_enrollment_primes_each_account(session_factory):
+    teller = StubTellerClient(
+        accounts=[
+            {"id": "acc_enroll_001", "name": "Checking", "currency": "USD"},
+            {"id": "acc_enroll_002", "name": "Savings", "currency": "USD"},
+        ],
+        balances={
+            "acc_enroll_001": {"available": "10.00", "ledger": "12.00", "currency": "USD"},
+            "acc_enroll_002": TellerAPIError(502, "upstream unavailable"),
+        },
+        transactions={
+            "acc_enroll_001": [
+                {"id": "txn_enroll_001", "amount": "-1.00", "date": "2025-10-01"},
+                {"id": "txn_enroll_002", "amount": "-2.00", "date": "2025-10-02"},
+            ],
+            "acc_enroll_002": [{"id": "txn_enroll_003", "amount": "5.00", "date": "2025-10-03"}],
+        },
+    )
+    client = _client(session_factory, teller)
+
+    resp = client.simulate_post(
+        "/api/enrollments",
+        json={"enrollment": {"accessToken": "token_enroll", "user": {"id": "user_enroll", "name": "Enrollee"}}},
+    )
+
+    assert resp.status_code == 200
+    assert [acct["id"] for acct in resp.json["accounts"]] == ["acc_enroll_001", "acc_enroll_002"]
+
+    listed = client.simulate_get("/api/db/accounts", headers={"Authorization": "Bearer token_enroll"})
+    assert listed.status_code == 200
+    assert listed.json["accounts"] == resp.json["accounts"]
+
+    balance = client.simulate_get(
+        "/api/db/accounts/acc_enroll_001/balances", headers={"Authorization": "Bearer token_enroll"}
+    )
+    assert balance.status_code == 200
+    assert balance.json["balance"] == {"available": "10.00", "ledger": "12.00", "currency": "USD"}
+    assert balance.json["cached_at"]
+    missing = client.simulate_get(
+        "/api/db/accounts/acc_enroll_002/balances", headers={"Authorization": "Bearer token_enroll"}
+    )
+    assert missing.status_code == 404
+
+    with session_factory() as session:
+        repo = Repository(session)
+        checking = repo.get_account("acc_enroll_001")
+        savings = repo.get_account("acc_enroll_002")
+        assert checking.balance is not None
+        assert savings.balance is None
+        assert {tx.id for tx in repo.list_transactions("acc_enroll_001")} == {"txn_enroll_001", "txn_enroll_002"}
+        assert [tx.id for tx in repo.list_transactions("acc_enroll_002")] == ["txn_enroll_003"]
+
+    resp = client.simulate_get(
+        "/api/db/accounts/acc_enroll_001/transactions",
+        params={"limit": "1"},
+        headers={"Authorization": "Bearer token_enroll"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json["account_id"] == "acc_enroll_001"
+    assert [tx["id"] for tx in resp.json["transactions"]] == ["txn_enroll_002"]
+    assert resp.json["cached_at"]
+
+    resp = client.simulate_get(
+        "/api/db/accounts/acc_enroll_001/transactions",
+        params={"fields": "summary"},
+        headers={"Authorization": "Bearer token_enroll"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json["transactions"] == [
+        {"id": "txn_enroll_002", "date": "2025-10-02", "amount": "-2.00", "description": None},
+        {"id": "txn_enroll_001", "date": "2025-10-01", "amount": "-1.00", "description": None},
+    ]
+
+
+def test_enrollment_requires_token_and_user(session_factory):
+    client = _client(session_factory, StubTellerClient([], {}, {}))
+
+    resp = client.simulate_post("/api/enrollments", json={"enrollment": {"user": {"id": "user_enroll"}}})
+
+    assert resp.status_code == 400
+
+
+def test_reenrollment_invalidates_cached_token(session_factory):
+    teller = StubTellerClient([], {}, {})
+    client = _client(session_factory, teller)
+
+    def enroll(token):
+        return client.simulate_post(
+            "/api/enrollments",
+            json={"enrollment": {"accessToken": token, "user": {"id": "user_rotate"}}},
+        )
+
+    assert enroll("token_rotate_old").status_code == 200
+    old_headers = {"Authorization": "Bearer token_rotate_old"}
+    assert client.simulate_get("/api/db/accounts", headers=old_headers).status_code == 200
+
+    assert enroll("token_rotate_new").status_code == 200
+    assert client.simulate_get("/api/db/accounts", headers=old_headers).status_code == 401
+    new_headers = {"Authorization": "Bearer token_rotate_new"}
+    assert client.simulate_get("/api/db/accounts", headers=new_headers).status_code == 200
+
+
+def test_live_refresh_updates_cache(session_factory):
+    teller = StubTellerClient(
+        accounts=[{"id": "acc_live_001", "name": "Checking"}],
+        balances={"acc_live_001": {"available": "1.00"}},
+        transactions={"acc_live_001": [{"id": "txn_live_001", "amount": "-1.00", "date": "2025-10-01"}]},
+    )
+    client = _client(session_factory, teller)
+    client.simulate_post(
+        "/api/enrollments",
+        json={"enrollment": {"accessToken": "token_live", "user": {"id": "user_live"}}},
+    )
+    headers = {"Authorization": "Bearer token_live"}
+    teller.balances["acc_live_001"] = {"available": "2.00"}
+    teller.transactions["acc_live_001"] = [{"id": "txn_live_002", "amount": "-2.00", "date": "2025-10-02"}]
+
+    balance = client.simulate_get("/api/accounts/acc_live_001/balances", headers=headers)
+    transactions = client.simulate_get("/api/accounts/acc_live_001/transactions", headers=headers)
+
+    assert balance.json == {"account_id": "acc_live_001", "balance": {"available": "2.00"}}
+    assert [tx["id"] for tx in transactions.json["transactions"]] == ["txn_live_002"]
+    cached = client.simulate_get("/api/db/accounts/acc_live_001/balances", headers=headers)
+    assert cached.json["balance"] == {"available": "2.00"}
+    assert client.simulate_get("/api/accounts/acc_other/balances", headers=headers).status_code == 404
+
+
+@pytest.mark.parametrize(
+    "header,status",
+    [
+        ("Bearer token_header", 200),
+        ("bearer\ttoken_header", 200),
+        ("  Bearer   token_header  ", 200),
+        ("Bearer token\theader", 401),
+        ("Bearer", 401),
+        ("Basic token_header", 401),
+    ],
+)
+def test_bearer_header_whitespace(session_factory, header, status):
+    client = _client(session_factory, StubTellerClient([], {}, {}))
+    client.simulate_post(
+        "/api/enrollments",
+        json={"enrollment": {"accessToken": "token_header", "user": {"id": "user_header"}}},
+    )
+
+    assert client.simulate_get("/api/db/accounts", headers={"Authorization": header}).status_code == status
@@ -0,0 +1,168 @@
+"""Static asset serving tests."""
+import gzip
+import pathlib
+import types
+
+import falcon
+import pytest
+from falcon import testing
+
+from python import static
+from python.static import StaticResource
+from python.teller import create_app
+
+STATIC_ROOT = pathlib.Path(__file__).resolve().parent.parent / "static"
+
+
+def _args(**overrides):
+    args = types.SimpleNamespace(
+        debug=False,
+        db_echo=False,
+        environment="sandbox",
+        application_id="app_test",
+        certificate=None,
+        private_key=None,
+        app_api_base_url="/api",
+        webhook_secrets="",
+        webhook_tolerance_seconds=180,
+    )
+    vars(args).update(overrides)
+    return args
+
+
+@pytest.fixture
+def client():
+    return testing.TestClient(create_app(_args()))
+
+
+def test_static_file_served_with_type_and_length(client):
+    resp = client.simulate_get("/static/styles.css")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/css")
+    assert resp.content == (STATIC_ROOT / "styles.css").read_bytes()
+    assert int(resp.headers["content-length"]) == len(resp.content)
+
+
+def test_static_file_gzipped_when_accepted(client):
+    resp = client.simulate_get("/static/index.js", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(resp.content) == (STATIC_ROOT / "index.js").read_bytes()
+
+    identity = client.simulate_get("/static/index.js", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] != resp.headers["etag"]
+
+
+def test_static_file_brotli_preferred_when_accepted(client):
+    brotli = pytest.importorskip("brotli")
+    resp = client.simulate_get("/static/index.js", headers={"Accept-Encoding": "gzip, br"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "br"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert brotli.decompress(resp.content) == (STATIC_ROOT / "index.js").read_bytes()
+
+
+def test_conditional_get_returns_not_modified(client):
+    first = client.simulate_get("/static/styles.css")
+
+    assert first.headers["etag"].startswith('W/"')
+    revalidated = client.simulate_get("/static/styles.css", headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == first.headers["etag"]
+
+    since = client.simulate_get("/static/styles.css", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert since.status_code == 304
+
+    changed = client.simulate_get("/static/styles.css", headers={"If-None-Match": 'W/"stale"'})
+    assert changed.status_code == 200
+    assert changed.content == first.content
+
+
+def test_compression_deferred_to_first_accepting_request(tmp_path, monkeypatch):
+    (tmp_path / "lazy.css").write_text("body { color: red; }\n" * 200)
+    calls = []
+    compress = static._COMPRESSORS["gzip"]
+    monkeypatch.setitem(static._COMPRESSORS, "gzip", lambda body: calls.append(len(body)) or compress(body))
+    app = falcon.App()
+    app.add_route("/static/{filename}", StaticResource(tmp_path))
+    client = testing.TestClient(app)
+    assert calls == []
+
+    plain = client.simulate_get("/static/lazy.css")
+    assert "content-encoding" not in plain.headers
+    assert calls == []
+
+    for _ in range(2):
+        resp = client.simulate_get("/static/lazy.css", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(resp.content) == plain.content
+    assert len(calls) == 1
+
+
+def test_fingerprinted_assets_are_immutable(tmp_path):
+    (tmp_path / "app.3f9a1c2e.js").write_text("console.log(1);")
+    (tmp_path / "app.js").write_text("console.log(2);")
+    app = falcon.App()
+    app.add_route("/static/{filename}", StaticResource(tmp_path))
+    client = testing.TestClient(app)
+
+    hashed = client.simulate_get("/static/app.3f9a1c2e.js")
+    plain = client.simulate_get("/static/app.js")
+
+    assert hashed.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert plain.headers["cache-control"] == "public, max-age=3600"
+
+
+def test_index_served(client):
+    resp = client.simulate_get("/")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/html")
+    assert resp.content == (STATIC_ROOT / "index.html").read_bytes()
+    assert client.simulate_get("/", headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+
+
+@pytest.mark.parametrize("filename", ["missing.js", "..", "%2e%2e%2fREADME.md", "..%5cREADME.md", "index.html%00.js"])
+def test_unknown_or_outside_paths_are_not_found(client, filename):
+    resp = client.simulate_get(f"/static/{filename}")
+
+    assert resp.status_code == 404
+
+
+def test_symlink_outside_root_is_not_served(tmp_path):
+    root = tmp_path / "static"
+    root.mkdir()
+    secret = tmp_path / "secret.txt"
+    secret.write_text("secret")
+    (root / "leak.txt").symlink_to(secret)
+    app = falcon.App()
+    app.add_route("/static/{filename}", StaticResource(root))
+    client = testing.TestClient(app)
+
+    assert client.simulate_get("/static/leak.txt").status_code == 404
+
+
+def test_static_routes_can_be_left_to_a_proxy():
+    client = testing.TestClient(create_app(_args(serve_static=False)))
+
+    assert client.simulate_get("/").status_code == 404
+    assert client.simulate_get("/static/styles.css").status_code == 404
+    health = client.simulate_get("/api/healthz")
+    assert health.status_code == 200
+    assert health.json == {"status": "ok", "environment": "sandbox"}
+
+
+def test_config_revalidates_with_etag(client):
+    first = client.simulate_get("/api/config")
+
+    assert first.status_code == 200
+    assert first.json["environment"] == "sandbox"
+    again = client.simulate_get("/api/config", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
@@ -0,0 +1,49 @@
+"""Teller HTTP client tests against a local stand-in server."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from python.teller_api import BASE_URL, _build_session
+
+
+class _UnavailableHandler(BaseHTTPRequestHandler):
+    attempts = 0
+
+    def do_GET(self):
+        type(self).attempts += 1
+        self.send_response(503)
+        self.send_header("Retry-After", "120")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def unavailable_server():
+    _UnavailableHandler.attempts = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UnavailableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_gateway_errors_retried_without_honouring_retry_after(unavailable_server):
+    session = _build_session(None)
+    session.mount("http://", session.get_adapter(BASE_URL))
+    host, port = unavailable_server.server_address
+
+    started = time.monotonic()
+    resp = session.get(f"http://{host}:{port}/accounts", timeout=5)
+    elapsed = time.monotonic() - started
+
+    assert resp.status_code == 503
+    assert _UnavailableHandler.attempts == 3
+    assert elapsed < 5
@@ -0,0 +1,34 @@
+"""Tests for shared helpers."""
+from python.utils import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired_entries():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_ttl_cache_add_only_stores_absent_or_expired_keys():
+    now = [0.0]
+    cache = TTLCache(maxsize=4, ttl=10, timer=lambda: now[0])
+
+    assert cache.add("a", 1) is True
+    assert cache.add("a", 2) is False
+    assert cache.get("a") == 1
+
+    now[0] = 10.0
+    assert cache.add("a", 3) is True
+    cache.discard("a")
+    assert cache.get("a") is None
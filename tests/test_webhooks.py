@@ -5,6 +5,8 @@ import hmac
 import hashlib
 import time
 
+import orjson
+import pytest
 from falcon import testing
 
 from python.teller import create_app
@@ -25,10 +27,18 @@ def _make_app_with_secrets(secrets: str):
     return create_app(args)
 
 
+@pytest.fixture(scope="module")
+def client():
+    # One app per module: every test here signs with the same server secret.
+    # The app's replay cache is shared too, so each test posts its own event id.
+    return testing.TestClient(_make_app_with_secrets("secret1"))
+
+
 def _signed_headers(secret: str, body: dict):
-    raw = json.dumps(body, separators=(",", ":"))
-    ts = str(int(time.time()))
-    msg = f"{ts}.{raw}".encode()
+    # Encode once; these exact bytes are both signed and sent.
+    raw = orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+    ts = int(time.time())
+    msg = b"%d." % ts + raw
     sig = hmac.new(secret.encode(), msg, hashlib.sha256).hexdigest()
     return {
         "Content-Type": "application/json",
@@ -36,27 +46,94 @@ def _signed_headers(secret: str, body: dict):
     }, raw
 
 
-def test_webhook_test_event_success():
-    app = _make_app_with_secrets("secret1")
-    client = testing.TestClient(app)
-
-    body = {"id": "wh_test", "payload": {}, "timestamp": "2025-01-01T00:00:00Z", "type": "webhook.test"}
+def test_webhook_test_event_success(client):
+    body = {"id": "wh_success", "payload": {}, "timestamp": "2025-01-01T00:00:00Z", "type": "webhook.test"}
     headers, raw = _signed_headers("secret1", body)
 
     resp = client.simulate_post("/api/webhooks/teller", headers=headers, body=raw)
     assert resp.status_code == 200
-    data = resp.json
-    assert data.get("ok") is True
+    assert resp.json == {"ok": True, "echo": "wh_success"}
+
 
+def test_webhook_verifies_raw_body_bytes(client):
+    # Signatures cover the bytes as sent, so formatting that a re-serialized
+    # payload would not reproduce must still verify.
+    raw = json.dumps({"id": "wh_spaced", "payload": {}, "type": "webhook.test"}, indent=2)
+    ts = str(int(time.time()))
+    sig = hmac.new(b"secret1", f"{ts}.{raw}".encode(), hashlib.sha256).hexdigest()
+    headers = {"Content-Type": "application/json", "Teller-Signature": f"t={ts},v1={sig}"}
 
-def test_webhook_invalid_signature():
-    app = _make_app_with_secrets("secret1")
-    client = testing.TestClient(app)
+    resp = client.simulate_post("/api/webhooks/teller", headers=headers, body=raw)
+    assert resp.status_code == 200
+    assert resp.json == {"ok": True, "echo": "wh_spaced"}
 
-    body = {"id": "wh_test", "payload": {}, "timestamp": "2025-01-01T00:00:00Z", "type": "webhook.test"}
+
+def test_webhook_reserialized_body_rejected(client):
+    body = {"id": "wh_reserialized", "payload": {}, "type": "webhook.test"}
+    headers, raw = _signed_headers("secret1", body)
+    # Same JSON value, different key order: not the bytes that were signed.
+    reordered = json.dumps(dict(reversed(list(json.loads(raw).items()))), separators=(",", ":")).encode()
+    assert reordered != raw
+
+    resp = client.simulate_post("/api/webhooks/teller", headers=headers, body=reordered)
+    assert resp.status_code == 401
+
+
+def test_webhook_invalid_signature(client):
+    body = {"id": "wh_bad_signature", "payload": {}, "timestamp": "2025-01-01T00:00:00Z", "type": "webhook.test"}
     # Sign with a different secret
     headers, raw = _signed_headers("wrong", body)
 
     resp = client.simulate_post("/api/webhooks/teller", headers=headers, body=raw)
     assert resp.status_code == 401
 
+
+def test_webhook_signature_compared_in_constant_time(client, monkeypatch):
+    calls = []
+    real_compare = hmac.compare_digest
+
+    def recording_compare(a, b):
+        calls.append((len(a), len(b)))
+        return real_compare(a, b)
+
+    monkeypatch.setattr(hmac, "compare_digest", recording_compare)
+    body = {"id": "wh_constant_time", "payload": {}, "type": "webhook.test"}
+    headers, raw = _signed_headers("secret1", body)
+
+    resp = client.simulate_post("/api/webhooks/teller", headers=headers, body=raw)
+
+    assert resp.status_code == 200
+    assert resp.json == {"ok": True, "echo": "wh_constant_time"}
+    assert calls == [(hashlib.sha256().digest_size, hashlib.sha256().digest_size)]
+
+
+def test_webhook_stale_timestamp_rejected_before_hashing(client, monkeypatch):
+    monkeypatch.setattr(hmac, "compare_digest", lambda a, b: pytest.fail("signature was checked"))
+
+    raw = json.dumps({"id": "wh_old", "payload": {}, "type": "webhook.test"}, separators=(",", ":"))
+    ts = str(int(time.time()) - 10_000)
+    sig = hmac.new(b"secret1", f"{ts}.{raw}".encode(), hashlib.sha256).hexdigest()
+    headers = {"Content-Type": "application/json", "Teller-Signature": f"t={ts},v1={sig}"}
+
+    resp = client.simulate_post("/api/webhooks/teller", headers=headers, body=raw)
+    assert resp.status_code == 401
+
+
+def test_webhook_duplicate_delivery_handled_once(client):
+    body = {"id": "wh_dupe", "payload": {"transactions": [{}, {}]}, "type": "transactions.processed"}
+    headers, raw = _signed_headers("secret1", body)
+
+    first = client.simulate_post("/api/webhooks/teller", headers=headers, body=raw)
+    second = client.simulate_post("/api/webhooks/teller", headers=headers, body=raw)
+
+    assert first.json == {"ok": True, "processed": 2}
+    assert second.status_code == 200
+    assert second.json == {"ok": True, "duplicate": True}
+
+
+def test_webhook_oversized_payload_rejected(client):
+    body = {"id": "wh_big", "payload": {"blob": "x" * (1024 * 1024)}, "type": "webhook.test"}
+    headers, raw = _signed_headers("secret1", body)
+
+    resp = client.simulate_post("/api/webhooks/teller", headers=headers, body=raw)
+    assert resp.status_code == 413